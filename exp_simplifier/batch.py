@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Upraszczanie wyrażeń logicznych partiami, w puli procesów roboczych.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+import time
+
+from exp_simplifier.cubes import make_sop
+from exp_simplifier.expr import parse, to_string
+from exp_simplifier.instrument import StageRecorder, Unsimplified
+from exp_simplifier.validate import simplify_cover
+
+
+class InvalidExpressionError(ValueError):
+    pass
+
+
+def _simplify(expr, method, max_seconds=None, max_minterms=None, instrument=None):
+    try:
+        node, variables = parse(expr) if expr else (None, None)
+    except Exception as e:
+        return None, e
+    if node is None:
+        return None, InvalidExpressionError('%s is not a valid logical expression' % expr)
+
+    try:
+        cover = simplify_cover(node, variables, method, None, instrument, max_seconds, max_minterms)
+    except Exception as e:
+        return variables, e
+
+    if isinstance(cover, bool):
+        return variables, cover
+    elif cover is None:
+        return variables, Unsimplified(to_string(node))
+    return variables, make_sop(cover, variables)
+
+
+def simplify_one(expr, method='exact', max_seconds=None, max_minterms=None):
+    return _simplify(expr, method, max_seconds, max_minterms)[1]
+
+
+def simplify_record(expr, method='exact', max_seconds=None, max_minterms=None):
+    start = time.perf_counter()
+    recorder = StageRecorder()
+    variables, result = _simplify(expr, method, max_seconds, max_minterms, recorder)
+    record = {'input': expr, 'simplified': None, 'variables': variables}
+    if isinstance(result, Exception):
+        record['error'] = str(result)
+    else:
+        record['simplified'] = result
+    if recorder.degraded:
+        record['degraded'] = recorder.degraded
+    record['seconds'] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def _map_chunk(func, exprs, options):
+    return [func(expr, **options) for expr in exprs]
+
+
+def _chunks(iterable, chunksize):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_map(func, iterable, workers, chunksize, options, prefetch):
+    if workers == 1:
+        for expr in iterable:
+            yield func(expr, **options)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    pending = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        try:
+            for chunk in _chunks(iterable, chunksize):
+                pending.append(executor.submit(_map_chunk, func, chunk, options))
+                if len(pending) >= workers * prefetch:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iter_simplify(iterable, workers=None, chunksize=64, method='exact', prefetch=2, max_seconds=None,
+                  max_minterms=None):
+    if chunksize < 1:
+        raise ValueError('chunksize must be at least 1')
+    options = {'method': method, 'max_seconds': max_seconds, 'max_minterms': max_minterms}
+    return _iter_map(simplify_one, iterable, workers, chunksize, options, prefetch)
+
+
+def simplify_many(iterable, workers=None, chunksize=64, method='exact', max_seconds=None, max_minterms=None):
+    return list(iter_simplify(iterable, workers, chunksize, method, max_seconds=max_seconds,
+                              max_minterms=max_minterms))
+
+
+def read_expressions(file):
+    for line in file:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError('%s is not a positive integer' % value)
+    return number
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError('%s is not a non-negative integer' % value)
+    return number
+
+
+def setup_parser():
+    """Setup argument parser."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('input', help='file with one expression per line, or - for standard input')
+    parser.add_argument('-o', '--output', help='JSON Lines output file (standard output by default)')
+    parser.add_argument('-w', '--workers', type=non_negative_int, default=1, help='worker processes (0 for one per CPU)')
+    parser.add_argument('-c', '--chunksize', type=positive_int, default=64, help='expressions sent to a worker at once')
+    parser.add_argument('-m', '--method', choices=['exact', 'heuristic'], default='exact',
+                        help='minimization method')
+    parser.add_argument('--max-seconds', type=float, help='time budget per expression')
+    parser.add_argument('--max-minterms', type=int, help='ON-set size above which the heuristic method is used')
+    return parser
+
+
+def main():
+    """Simplify every expression of the input and write one record per line."""
+    args = setup_parser().parse_args()
+    source = sys.stdin if args.input == '-' else open(args.input)
+    target = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        options = {'method': args.method, 'max_seconds': args.max_seconds, 'max_minterms': args.max_minterms}
+        records = _iter_map(simplify_record, read_expressions(source), args.workers or None,
+                            args.chunksize, options, 2)
+        for record in records:
+            target.write(json.dumps(record) + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""
+Zredukowane uporządkowane diagramy decyzyjne (ROBDD).
+
+- węzły 0 i 1 to stałe fałsz i prawda,
+- tablica unikalna gwarantuje kanoniczność: dwie funkcje są równoważne
+  wtedy i tylko wtedy, gdy mają ten sam numer węzła,
+- wyniki operacji są zapamiętywane w tablicy obliczonych wyników,
+- kolejność zmiennych wybierana heurystycznie (domyślnie kolejność
+  pierwszego wystąpienia w wyrażeniu),
+- z podanym terminem (deadline) budowa diagramu i wyliczanie mintermów
+  zgłaszają BudgetExceeded po jego upływie
+"""
+
+from exp_simplifier.expr import Var, Const, Not, And, Or, Xor, Imp, Equ, parse, postorder
+from exp_simplifier.instrument import check_deadline
+
+
+FALSE = 0
+TRUE = 1
+
+
+def order_variables(node, order='appearance'):
+    nodes = postorder(node)
+    names = [n.name for n in nodes if isinstance(n, Var)]
+    if order == 'sorted':
+        return sorted(names)
+    elif order == 'appearance':
+        return names
+    elif order == 'frequency':
+        counts = dict.fromkeys(names, 0)
+        for n in nodes:
+            for c in n.children:
+                if isinstance(c, Var):
+                    counts[c.name] += 1
+        return sorted(names, key=lambda v: -counts[v])
+    raise ValueError('unknown variable order: %s' % order)
+
+
+class BDD(object):
+    def __init__(self, variables, deadline=None):
+        self.variables = list(variables)
+        self.deadline = deadline
+        self.levels = {v: i for i, v in enumerate(self.variables)}
+        terminal = len(self.variables)
+        self._level = [terminal, terminal]
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self.unique = {}
+        self.computed = {}
+
+    def __len__(self):
+        return len(self._level)
+
+    def mk(self, level, low, high):
+        if low == high:
+            return low
+        key = (level, low, high)
+        u = self.unique.get(key)
+        if u is None:
+            u = len(self._level)
+            if self.deadline is not None and not u & 0xfff:
+                check_deadline(self.deadline, 'min_terms')
+            self._level.append(level)
+            self._low.append(low)
+            self._high.append(high)
+            self.unique[key] = u
+        return u
+
+    def var(self, name):
+        return self.mk(self.levels[name], FALSE, TRUE)
+
+    def neg(self, u):
+        if u <= TRUE:
+            return 1 - u
+        key = ('not', u)
+        r = self.computed.get(key)
+        if r is None:
+            r = self.mk(self._level[u], self.neg(self._low[u]), self.neg(self._high[u]))
+            self.computed[key] = r
+        return r
+
+    def apply(self, op, u, v):
+        if op == 'and':
+            if u == FALSE or v == FALSE:
+                return FALSE
+            if u == TRUE or u == v:
+                return v
+            if v == TRUE:
+                return u
+        elif op == 'or':
+            if u == TRUE or v == TRUE:
+                return TRUE
+            if u == FALSE or u == v:
+                return v
+            if v == FALSE:
+                return u
+        elif op == 'xor':
+            if u == v:
+                return FALSE
+            if u == FALSE:
+                return v
+            if v == FALSE:
+                return u
+            if u == TRUE:
+                return self.neg(v)
+            if v == TRUE:
+                return self.neg(u)
+        else:
+            raise ValueError('unknown operation: %s' % op)
+
+        if u > v:
+            u, v = v, u
+        key = (op, u, v)
+        r = self.computed.get(key)
+        if r is None:
+            level_u, level_v = self._level[u], self._level[v]
+            level = min(level_u, level_v)
+            u0, u1 = (self._low[u], self._high[u]) if level_u == level else (u, u)
+            v0, v1 = (self._low[v], self._high[v]) if level_v == level else (v, v)
+            r = self.mk(level, self.apply(op, u0, v0), self.apply(op, u1, v1))
+            self.computed[key] = r
+        return r
+
+    def from_expr(self, node):
+        result = {}
+        for n in postorder(node):
+            check_deadline(self.deadline, 'min_terms')
+            if isinstance(n, Var):
+                result[n] = self.var(n.name)
+            elif isinstance(n, Const):
+                result[n] = TRUE if n.value else FALSE
+            elif isinstance(n, Not):
+                result[n] = self.neg(result[n.arg])
+            else:
+                a, b = result[n.left], result[n.right]
+                if isinstance(n, And):
+                    result[n] = self.apply('and', a, b)
+                elif isinstance(n, Or):
+                    result[n] = self.apply('or', a, b)
+                elif isinstance(n, Xor):
+                    result[n] = self.apply('xor', a, b)
+                elif isinstance(n, Imp):
+                    result[n] = self.apply('or', self.neg(a), b)
+                elif isinstance(n, Equ):
+                    result[n] = self.neg(self.apply('xor', a, b))
+        return result[node]
+
+    def size(self, u):
+        seen = set()
+        stack = [u]
+        while stack:
+            x = stack.pop()
+            if x not in seen:
+                seen.add(x)
+                if x > TRUE:
+                    stack.append(self._low[x])
+                    stack.append(self._high[x])
+        return len(seen)
+
+    def sat_count(self, u):
+        counts = {FALSE: 0, TRUE: 1}
+        stack = [u]
+        while stack:
+            x = stack[-1]
+            if x in counts:
+                stack.pop()
+                continue
+            low, high = self._low[x], self._high[x]
+            if low in counts and high in counts:
+                stack.pop()
+                level = self._level[x]
+                counts[x] = (counts[low] << (self._level[low] - level - 1)) + \
+                    (counts[high] << (self._level[high] - level - 1))
+            else:
+                stack.append(low)
+                stack.append(high)
+        return counts[u] << self._level[u]
+
+    def cubes(self, u, variables=None):
+        variables = self.variables if variables is None else variables
+        n = len(variables)
+        full = (1 << n) - 1
+        bits = [1 << (n - 1 - variables.index(v)) for v in self.variables]
+        stack = [(u, 0, 0)]
+        while stack:
+            x, value, care = stack.pop()
+            if x == TRUE:
+                yield value, full & ~care
+            elif x != FALSE:
+                bit = bits[self._level[x]]
+                stack.append((self._high[x], value | bit, care | bit))
+                stack.append((self._low[x], value, care | bit))
+
+    def minterms(self, u, variables=None):
+        count = 0
+        for value, mask in self.cubes(u, variables):
+            sub = mask
+            while True:
+                yield value | sub
+                count += 1
+                if self.deadline is not None and not count & 0xfff:
+                    check_deadline(self.deadline, 'min_terms')
+                if sub == 0:
+                    break
+                sub = (sub - 1) & mask
+
+
+def build(node, variables=None, order='appearance'):
+    variables = order_variables(node, order) if variables is None else variables
+    manager = BDD(variables)
+    return manager, manager.from_expr(node)
+
+
+def _parse(expr):
+    node, variables = parse(expr)
+    if node is None:
+        raise ValueError('%s is not a valid logical expression' % expr)
+    return node, variables
+
+
+def is_tautology(expr):
+    return build(_parse(expr)[0])[1] == TRUE
+
+
+def is_contradiction(expr):
+    return build(_parse(expr)[0])[1] == FALSE
+
+
+def equivalent(expr1, expr2):
+    node1, node2 = _parse(expr1)[0], _parse(expr2)[0]
+    variables = order_variables(And(node1, node2))
+    manager = BDD(variables)
+    return manager.from_expr(node1) == manager.from_expr(node2)
+
+
+def count_models(expr):
+    node, variables = _parse(expr)
+    manager, u = build(node)
+    return manager.sat_count(u)
+
+
+def min_terms(expr):
+    node, variables = _parse(expr)
+    manager, u = build(node)
+    return sorted(manager.minterms(u, variables)), variables
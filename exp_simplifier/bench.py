@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+"""
+Pomiar czasu kolejnych etapów simplify na wyrażeniach losowych i strukturalnych
+(opcjonalnie także drobnych edycji upraszczanych przyrostowo przez Simplifier).
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from exp_simplifier import bdd
+from exp_simplifier.cover import minimum_cover, prime_implicant_chart, implicant_costs
+from exp_simplifier.cubes import make_sop
+from exp_simplifier.expr import parse
+from exp_simplifier.incremental import Simplifier
+from exp_simplifier.validate import create_cube_groups, find_prime_implicants, simplify
+
+
+STAGES = ['validate', 'min_terms', 'merge', 'cover', 'make_expr']
+
+
+def names(prefix, n):
+    return ['%s%02d' % (prefix, i) for i in range(n)]
+
+
+def random_expr(n, seed=0):
+    rng = random.Random('%d:%d' % (seed, n))
+    leaves = names('x', n) + [rng.choice(names('x', n)) for _ in range(n)]
+    rng.shuffle(leaves)
+    terms = ['~' + v if rng.random() < 0.3 else v for v in leaves]
+    while len(terms) > 1:
+        i = rng.randrange(len(terms) - 1)
+        op = rng.choice([' & ', ' & ', ' | ', ' | ', ' ^ '])
+        terms[i:i + 2] = ['(%s%s%s)' % (terms[i], op, terms[i + 1])]
+    return terms[0]
+
+
+def parity_expr(n):
+    return ' ^ '.join(names('x', n))
+
+
+def mux_expr(n):
+    k = 1
+    while k + 1 + (1 << k + 1) <= n:
+        k += 1
+    select = names('s', k)
+    terms = []
+    for i, d in enumerate(names('d', 1 << k)):
+        literals = [s if i >> (k - 1 - j) & 1 else '~' + s for j, s in enumerate(select)]
+        terms.append(' & '.join(literals + [d]))
+    return ' | '.join(terms)
+
+
+def adder_expr(n):
+    carry = None
+    for a, b in zip(names('a', n // 2), names('b', n // 2)):
+        if carry is None:
+            carry = '%s & %s' % (a, b)
+        else:
+            carry = '%s & %s | (%s) & (%s ^ %s)' % (a, b, carry, a, b)
+    return carry
+
+
+FAMILIES = {
+    'random': random_expr,
+    'parity': parity_expr,
+    'mux': mux_expr,
+    'adder': adder_expr,
+}
+
+
+def run_stages(expr, max_minterms=None, max_seconds=None):
+    times = {}
+    info = {}
+
+    start = time.perf_counter()
+    node, variables = parse(expr)
+    times['validate'] = time.perf_counter() - start
+    info['variables'] = len(variables)
+
+    start = time.perf_counter()
+    manager = bdd.BDD(bdd.order_variables(node))
+    root = manager.from_expr(node)
+    info['minterms'] = manager.sat_count(root)
+    if max_minterms is not None and info['minterms'] > max_minterms:
+        times['min_terms'] = time.perf_counter() - start
+        info['skipped'] = 'minterms'
+        return times, info
+    ones = sorted(manager.minterms(root, variables))
+    times['min_terms'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    primes = sorted(find_prime_implicants(create_cube_groups(ones)))
+    times['merge'] = time.perf_counter() - start
+    info['primes'] = len(primes)
+
+    start = time.perf_counter()
+    chart = prime_implicant_chart(primes, ones)
+    cover = [primes[c] for c in minimum_cover(chart, implicant_costs(primes, len(variables)), max_seconds)]
+    times['cover'] = time.perf_counter() - start
+    info['cover'] = len(cover)
+
+    start = time.perf_counter()
+    make_sop(cover, variables)
+    times['make_expr'] = time.perf_counter() - start
+
+    return times, info
+
+
+def run_case(family, n, repeat=3, max_minterms=None, max_seconds=None, seed=0):
+    expr = random_expr(n, seed) if family == 'random' else FAMILIES[family](n)
+    best = {}
+    for _ in range(repeat):
+        gc.collect()
+        times, info = run_stages(expr, max_minterms, max_seconds)
+        for stage, seconds in times.items():
+            best[stage] = min(best.get(stage, seconds), seconds)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_stages(expr, max_minterms, max_seconds)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    record = {'family': family, 'size': n, 'length': len(expr)}
+    record.update(info)
+    record['stages'] = {stage: round(best[stage], 6) for stage in STAGES if stage in best}
+    record['total'] = round(sum(best.values()), 6)
+    record['peak_bytes'] = peak
+    return record
+
+
+def toggle_expr(expr, variables, rng, free=0):
+    kept = sorted(rng.sample(range(len(variables)), len(variables) - free))
+    literals = [rng.choice(['', '~']) + variables[i] for i in kept]
+    return '(%s) ^ %s' % (expr, ' & '.join(literals) or '1')
+
+
+def run_incremental(family, n, edits=5, free=2, seed=0):
+    expr = random_expr(n, seed) if family == 'random' else FAMILIES[family](n)
+    variables = parse(expr)[1]
+    rng = random.Random('%d:%d:edits' % (seed, n))
+    simplifier = Simplifier()
+    simplifier.simplify(expr)
+    incremental = fresh = 0.0
+    for _ in range(edits):
+        expr = toggle_expr(expr, variables, rng, free)
+        gc.collect()
+        start = time.perf_counter()
+        simplifier.simplify(expr)
+        incremental += time.perf_counter() - start
+        start = time.perf_counter()
+        simplify(expr)
+        fresh += time.perf_counter() - start
+    return {'family': family, 'size': n, 'edits': edits, 'free': free,
+            'incremental': round(incremental, 6), 'fresh': round(fresh, 6)}
+
+
+def run(families, sizes, repeat=3, max_minterms=None, max_seconds=None, seed=0, progress=None, edits=0, free=2):
+    results = []
+    for family in families:
+        for n in sizes:
+            record = run_case(family, n, repeat, max_minterms, max_seconds, seed)
+            results.append(record)
+            if progress is not None:
+                progress(record)
+    report = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'results': results,
+    }
+    if edits:
+        report['incremental'] = [run_incremental(family, n, edits, free, seed) for family in families for n in sizes
+                                 if max_minterms is None or 1 << n <= max_minterms]
+    return report
+
+
+def setup_parser():
+    """Setup argument parser."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-f', '--families', nargs='+', choices=sorted(FAMILIES), default=sorted(FAMILIES),
+                        help='expression families')
+    parser.add_argument('-s', '--sizes', nargs='+', type=int, default=[4, 8, 12, 16, 20, 24],
+                        help='numbers of variables')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='timed runs per case (the best one is kept)')
+    parser.add_argument('--max-minterms', type=int, default=1 << 12,
+                        help='skip the stages after min-terms above this ON-set size')
+    parser.add_argument('--max-seconds', type=float, default=10, help='time limit of the cover search')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random family')
+    parser.add_argument('--edits', type=int, default=0,
+                        help='also time this many small edits with the incremental Simplifier against simplify')
+    parser.add_argument('--edit-free', type=int, default=2, help='free variables of the cube each edit toggles')
+    parser.add_argument('-o', '--output', help='JSON output file (standard output by default)')
+    return parser
+
+
+def main():
+    """Run the benchmark and write the report as JSON."""
+    args = setup_parser().parse_args()
+
+    def progress(record):
+        print('%-7s %3d variables %10.6f s%s' % (record['family'], record['size'], record['total'],
+                                                 ' (skipped)' if 'skipped' in record else ''), file=sys.stderr)
+
+    report = run(args.families, args.sizes, args.repeat, args.max_minterms, args.max_seconds, args.seed, progress,
+                 args.edits, args.edit_free)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
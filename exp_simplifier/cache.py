@@ -0,0 +1,139 @@
+"""
+Pamięć podręczna (LRU) wyników upraszczania.
+
+- pierwszy poziom: ciąg tokenów wyrażenia (bez białych znaków między nimi),
+- drugi poziom: tablica prawdy przy kanonicznej kolejności zmiennych,
+  więc wyrażenia równoważne z dokładnością do kolejności argumentów lub
+  nazw zmiennych korzystają z tego samego wpisu
+"""
+
+import collections
+import threading
+import time
+
+from exp_simplifier.cubes import popcount, make_sop
+from exp_simplifier.expr import parse, to_string, tokenize, truth_table, variable_column
+from exp_simplifier.instrument import Unsimplified
+from exp_simplifier.validate import simplify_cover
+
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'table_hits', 'misses', 'maxsize', 'currsize'])
+
+
+def canonical_order(table, variables):
+    n = len(variables)
+    weights = [popcount(table & variable_column(i, n)) for i in range(n)]
+    return [variables[i] for i in sorted(range(n), key=lambda i: weights[i])]
+
+
+def permute_cube(cube, source, target):
+    n = len(source)
+    positions = {v: n - 1 - i for i, v in enumerate(target)}
+    value, mask = cube
+    new_value = new_mask = 0
+    for i, v in enumerate(source):
+        s, t = n - 1 - i, positions[v]
+        new_value |= (value >> s & 1) << t
+        new_mask |= (mask >> s & 1) << t
+    return new_value, new_mask
+
+
+class _LRU(object):
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = collections.OrderedDict()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value):
+        self.entries[key] = (value, time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+class SimplifyCache(object):
+    def __init__(self, maxsize=1024, ttl=None, max_table_variables=20):
+        self.maxsize = maxsize
+        self.max_table_variables = max_table_variables
+        self._texts = _LRU(maxsize, ttl)
+        self._tables = _LRU(maxsize, ttl)
+        self._lock = threading.Lock()
+        self.hits = self.table_hits = self.misses = 0
+
+    def simplify(self, expr, method='exact'):
+        if not expr:
+            return None
+
+        text_key = (method, ' '.join(tokenize(expr)))
+        with self._lock:
+            entry = self._texts.get(text_key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+
+        node, variables = parse(expr)
+        if node is None:
+            print('%s is not a valid logical expression' % expr)
+            return None
+
+        table_key = None
+        order = variables
+        if len(variables) <= self.max_table_variables:
+            table, _ = truth_table(node, variables)
+            order = canonical_order(table, variables)
+            table_key = (method, len(order), truth_table(node, order)[0])
+
+        with self._lock:
+            entry = None if table_key is None else self._tables.get(table_key)
+            if entry is not None:
+                self.table_hits += 1
+                cover = entry[0]
+            else:
+                self.misses += 1
+        if entry is None:
+            cover = simplify_cover(node, order, method)
+
+        if isinstance(cover, bool):
+            result = cover
+        elif cover is None:
+            result = Unsimplified(to_string(node))
+        else:
+            result = make_sop(sorted(permute_cube(c, order, variables) for c in cover), variables)
+
+        if cover is None:
+            return result
+
+        with self._lock:
+            if table_key is not None and entry is None:
+                self._tables.put(table_key, cover)
+            self._texts.put(text_key, result)
+
+        return result
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.table_hits, self.misses, self.maxsize,
+                             len(self._texts.entries))
+
+    def clear(self):
+        with self._lock:
+            self._texts.entries.clear()
+            self._tables.entries.clear()
+            self.hits = self.table_hits = self.misses = 0
+
+
+default_cache = SimplifyCache()
+
+
+def cached_simplify(expr, method='exact'):
+    return default_cache.simplify(expr, method)
@@ -0,0 +1,168 @@
+"""
+Minimalne pokrycie tablicy implikantów prostych.
+
+- wiersz tablicy to liczba całkowita, której bit j jest ustawiony, gdy
+  implikant j pokrywa dany minterm (tablica zajmuje bity, a nie listy
+  obiektów),
+- redukcja: implikanty zasadnicze, dominacja wierszy i kolumn,
+- cykliczny rdzeń rozwiązywany metodą podziału i ograniczeń, z opcjonalnym
+  limitem czasu (po jego przekroczeniu rozwiązanie jest dokańczane
+  zachłannie),
+- wiersze, których nie pokrywa żaden implikant, są pomijane (liczbę
+  pominiętych wierszy podaje stats['uncovered'])
+"""
+
+import time
+
+from exp_simplifier.cubes import popcount, cube_min_terms
+
+
+def iter_bits(x):
+    while x:
+        bit = x & -x
+        yield bit.bit_length() - 1
+        x ^= bit
+
+
+def prime_implicant_chart(cubes, min_terms):
+    rows = {m: 0 for m in min_terms}
+
+    for column, cube in enumerate(cubes):
+        bit = 1 << column
+        for m in cube_min_terms(cube):
+            if m in rows:
+                rows[m] |= bit
+
+    return list(rows.values())
+
+
+def implicant_costs(cubes, n):
+    full = (1 << n) - 1
+    return [n + 1 + popcount(full & ~mask) for _, mask in cubes]
+
+
+def reduce_chart(rows, cols, costs):
+    selected = []
+
+    while True:
+        rows = [r & cols for r in rows]
+        if not all(rows):
+            return None, cols, selected
+
+        essential = 0
+        for r in rows:
+            if r & (r - 1) == 0:
+                essential |= r
+        if essential:
+            selected.extend(iter_bits(essential))
+            rows = [r for r in rows if not r & essential]
+            cols &= ~essential
+            continue
+
+        reduced = []
+        for r in sorted(set(rows), key=popcount):
+            if not any(s & ~r == 0 for s in reduced):
+                reduced.append(r)
+
+        columns = {}
+        for i, r in enumerate(reduced):
+            for c in iter_bits(r):
+                columns[c] = columns.get(c, 0) | 1 << i
+        kept = []
+        for c, covered in sorted(columns.items(), key=lambda item: (-popcount(item[1]), costs[item[0]], item[0])):
+            if not any(covered & ~k_covered == 0 and costs[k] <= costs[c] for k, k_covered in kept):
+                kept.append((c, covered))
+        reduced_cols = sum(1 << c for c, _ in kept)
+
+        if len(reduced) == len(rows) and reduced_cols == cols:
+            return rows, cols, selected
+        rows, cols = reduced, reduced_cols
+
+
+def greedy_cover(rows, cols, costs):
+    selected = []
+    rows = [r & cols for r in rows if r & cols]
+
+    while rows:
+        counts = {}
+        for r in rows:
+            for c in iter_bits(r):
+                counts[c] = counts.get(c, 0) + 1
+        best = max(counts, key=lambda c: (counts[c] / costs[c], -c))
+        selected.append(best)
+        rows = [r for r in rows if not r >> best & 1]
+
+    return selected
+
+
+def lower_bound(rows, costs):
+    bound = 0
+    used = 0
+    for r in sorted(rows, key=popcount):
+        if not r & used:
+            used |= r
+            bound += min(costs[c] for c in iter_bits(r))
+    return bound
+
+
+class CoverSearch(object):
+    def __init__(self, costs, max_seconds=None):
+        self.costs = costs
+        self.deadline = None if max_seconds is None else time.monotonic() + max_seconds
+        self.best = None
+        self.best_cost = float('inf')
+        self.iterations = 0
+        self.timed_out = False
+
+    def record(self, chosen):
+        cost = sum(self.costs[c] for c in chosen)
+        if cost < self.best_cost:
+            self.best = sorted(chosen)
+            self.best_cost = cost
+
+    def solve(self, rows, cols, initial=None):
+        if initial:
+            selected = sum(1 << c for c in initial)
+            uncovered = [r for r in rows if not r & selected]
+            self.record(list(initial) + greedy_cover(uncovered, cols, self.costs))
+        self.record(greedy_cover(rows, cols, self.costs))
+        self.branch(rows, cols, [])
+        return self.best
+
+    def branch(self, rows, cols, chosen):
+        self.iterations += 1
+        rows, cols, essential = reduce_chart(rows, cols, self.costs)
+        if rows is None:
+            return
+        chosen = chosen + essential
+        cost = sum(self.costs[c] for c in chosen)
+        if not rows:
+            self.record(chosen)
+            return
+        if cost + lower_bound(rows, self.costs) >= self.best_cost:
+            return
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.timed_out = True
+            self.record(chosen + greedy_cover(rows, cols, self.costs))
+            return
+
+        row = min(rows, key=popcount)
+        coverage = {c: sum(1 for r in rows if r >> c & 1) for c in iter_bits(row)}
+        for c in sorted(coverage, key=lambda c: (-coverage[c] / self.costs[c], c)):
+            bit = 1 << c
+            self.branch([r for r in rows if not r & bit], cols & ~bit, chosen + [c])
+            cols &= ~bit
+
+
+def minimum_cover(rows, costs, max_seconds=None, initial=None, stats=None):
+    cols = 0
+    for r in rows:
+        cols |= r
+    coverable = [r for r in rows if r]
+    search = CoverSearch(costs, max_seconds)
+    selected = search.solve(coverable, cols, initial)
+    if stats is not None:
+        stats['uncovered'] = len(rows) - len(coverable)
+        stats['iterations'] = search.iterations
+        stats['timed_out'] = search.timed_out
+    return selected
@@ -0,0 +1,137 @@
+"""
+Kostki (implikanty) w postaci pary liczb całkowitych (value, mask).
+
+- bit zmiennej i (licząc od lewej) to bit n - 1 - i,
+- mask: pozycje nieistotne (don't care),
+- value: wartości pozycji istotnych, zero na pozycjach z mask
+"""
+
+from exp_simplifier.instrument import check_deadline
+
+try:
+    popcount = int.bit_count
+except AttributeError:
+    def popcount(x):
+        return bin(x).count('1')
+
+
+def bits_to_cube(bits):
+    value = mask = 0
+    for b in bits:
+        value <<= 1
+        mask <<= 1
+        if b is None:
+            mask |= 1
+        elif b:
+            value |= 1
+    return value, mask
+
+
+def cube_to_bits(cube, n):
+    value, mask = cube
+    return tuple(None if mask >> s & 1 else value >> s & 1 for s in range(n - 1, -1, -1))
+
+
+def cube_min_terms(cube):
+    value, mask = cube
+    min_terms = []
+    sub = mask
+    while True:
+        min_terms.append(value | sub)
+        if sub == 0:
+            break
+        sub = (sub - 1) & mask
+    return min_terms[::-1]
+
+
+def merge_cubes(cube1, cube2):
+    (value1, mask1), (value2, mask2) = cube1, cube2
+    if mask1 != mask2:
+        return None
+    diff = value1 ^ value2
+    if popcount(diff) > 1:
+        return None
+    return value1 & ~diff, mask1 | diff
+
+
+def intersects(cube1, cube2):
+    (value1, mask1), (value2, mask2) = cube1, cube2
+    return (value1 ^ value2) & ~(mask1 | mask2) == 0
+
+
+def intersection(cube1, cube2):
+    (value1, mask1), (value2, mask2) = cube1, cube2
+    return value1 | value2, mask1 & mask2
+
+
+def contains(cube1, cube2):
+    (value1, mask1), (value2, mask2) = cube1, cube2
+    return mask2 & ~mask1 == 0 and (value1 ^ value2) & ~mask1 == 0
+
+
+def literal_count(cubes, full):
+    return sum(popcount(full & ~mask) for _, mask in cubes)
+
+
+def cofactor(cubes, cube):
+    value, mask = cube
+    care = ~mask
+    return [(v & mask, m | care) for v, m in cubes if (v ^ value) & ~(m | mask) == 0]
+
+
+def tautology(cubes, free):
+    if not cubes:
+        return False
+    positive = negative = 0
+    binate = 0
+    for value, mask in cubes:
+        care = free & ~mask
+        if care == 0:
+            return True
+        binate |= positive & care & ~value | negative & value
+        positive |= value & care
+        negative |= care & ~value
+    if binate == 0:
+        return False
+    best, best_count = 0, -1
+    bits = binate
+    while bits:
+        bit = bits & -bits
+        bits ^= bit
+        count = sum(1 for _, mask in cubes if not mask & bit)
+        if count > best_count:
+            best, best_count = bit, count
+    rest = free & ~best
+    return tautology(cofactor(cubes, (best, ~best)), rest) and \
+        tautology(cofactor(cubes, (0, ~best)), rest)
+
+
+def covers(cubes, cube):
+    return tautology(cofactor(cubes, cube), cube[1])
+
+
+def absorb(cubes, deadline=None):
+    result = []
+    for cube in sorted(set(cubes), key=lambda c: -popcount(c[1])):
+        check_deadline(deadline, 'espresso')
+        if not any(contains(c, cube) for c in result):
+            result.append(cube)
+    return result
+
+
+def make_sop(cubes, variables):
+    n = len(variables)
+    or_joined = []
+    for value, mask in cubes:
+        and_joined = []
+        for i in range(n):
+            s = n - 1 - i
+            if mask >> s & 1:
+                continue
+            elif value >> s & 1:
+                and_joined.append(variables[i])
+            else:
+                and_joined.append('~' + variables[i])
+        or_joined.append(' & '.join(and_joined))
+
+    return ' | '.join(or_joined)
@@ -0,0 +1,162 @@
+"""
+Heurystyczna minimalizacja w stylu Espresso (expand, irredundant, reduce).
+
+Pokrycie zbioru ON jest budowane bezpośrednio z drzewa wyrażenia, bez
+wyliczania tablicy prawdy, a rozszerzanie kostek sprawdza zawieranie
+w pokryciu (tautologia kofaktora) zamiast liczyć dopełnienie (zbiór OFF).
+
+Bez podanych limitów simplify ogranicza liczbę kostek pokrycia do MAX_CUBES
+i czas do MAX_SECONDS; gdy czas upłynie po pierwszym przebiegu, zwracane
+jest najlepsze dotąd pokrycie.
+"""
+
+from exp_simplifier.cubes import popcount, intersects, intersection, contains, covers, absorb, literal_count
+from exp_simplifier.expr import Var, Const, Not, And, Or, Xor, Imp, Equ, postorder
+from exp_simplifier.instrument import BudgetExceeded, check_deadline
+
+
+MAX_CUBES = 1 << 12
+MAX_SECONDS = 10.0
+
+
+def _product(cover1, cover2, max_cubes=None, deadline=None):
+    cubes = []
+    for c1 in cover1:
+        check_deadline(deadline, 'espresso')
+        cubes.extend(intersection(c1, c2) for c2 in cover2 if intersects(c1, c2))
+        if max_cubes is not None and len(cubes) > max_cubes:
+            raise BudgetExceeded('espresso')
+    return absorb(cubes, deadline)
+
+
+_needs = {
+    And: lambda value: ((value, value),),
+    Or: lambda value: ((value, value),),
+    Imp: lambda value: ((not value, value),),
+    Xor: lambda value: ((True, True), (False, False), (True, False), (False, True)),
+    Equ: lambda value: ((True, True), (False, False), (True, False), (False, True)),
+}
+
+
+def expr_to_cover(node, variables, value=True, deadline=None, max_cubes=None):
+    n = len(variables)
+    full = (1 << n) - 1
+    positions = {v: 1 << (n - 1 - i) for i, v in enumerate(variables)}
+
+    order = postorder(node)
+    needed = {x: set() for x in order}
+    needed[node].add(value)
+    for x in reversed(order):
+        for v in needed[x]:
+            if isinstance(x, Not):
+                needed[x.arg].add(not v)
+            elif x.children:
+                for left, right in _needs[type(x)](v):
+                    needed[x.left].add(left)
+                    needed[x.right].add(right)
+
+    cover = {}
+    for x in order:
+        check_deadline(deadline, 'espresso')
+        for v in needed[x]:
+            if isinstance(x, Var):
+                bit = positions[x.name]
+                cover[x, v] = [(bit if v else 0, full ^ bit)]
+            elif isinstance(x, Const):
+                cover[x, v] = [(0, full)] if x.value == v else []
+            elif isinstance(x, Not):
+                cover[x, v] = cover[x.arg, not v]
+            elif isinstance(x, And) and v or isinstance(x, Or) and not v:
+                cover[x, v] = _product(cover[x.left, v], cover[x.right, v], max_cubes, deadline)
+            elif isinstance(x, (And, Or)):
+                cover[x, v] = absorb(cover[x.left, v] + cover[x.right, v], deadline)
+            elif isinstance(x, Imp):
+                if v:
+                    cover[x, v] = absorb(cover[x.left, False] + cover[x.right, True], deadline)
+                else:
+                    cover[x, v] = _product(cover[x.left, True], cover[x.right, False], max_cubes, deadline)
+            else:
+                equal = v == isinstance(x, Equ)
+                cover[x, v] = absorb(_product(cover[x.left, True], cover[x.right, equal], max_cubes, deadline) +
+                                     _product(cover[x.left, False], cover[x.right, not equal], max_cubes, deadline),
+                                     deadline)
+            if max_cubes is not None and len(cover[x, v]) > max_cubes:
+                raise BudgetExceeded('espresso')
+
+    return cover[node, value]
+
+
+def expand(on, care_set, full, deadline=None):
+    result = []
+    for cube in sorted(on, key=lambda c: popcount(c[1]), reverse=True):
+        if any(contains(c, cube) for c in result):
+            continue
+        value, mask = cube
+        care = full & ~mask
+        while care:
+            check_deadline(deadline, 'espresso')
+            bit = care & -care
+            care ^= bit
+            raised = value & ~bit, mask | bit
+            if covers(care_set, raised):
+                value, mask = raised
+        result = [c for c in result if not contains((value, mask), c)]
+        result.append((value, mask))
+    return result
+
+
+def irredundant(on, dc=(), deadline=None):
+    result = list(on)
+    for cube in sorted(on, key=lambda c: popcount(c[1])):
+        check_deadline(deadline, 'espresso')
+        rest = [c for c in result if c is not cube] + list(dc)
+        if rest and covers(rest, cube):
+            result.remove(cube)
+    return result
+
+
+def reduce(on, dc=(), deadline=None):
+    result = list(on)
+    for index in sorted(range(len(result)), key=lambda i: popcount(result[i][1]), reverse=True):
+        rest = result[:index] + result[index + 1:] + list(dc)
+        value, mask = result[index]
+        free = mask
+        while free:
+            check_deadline(deadline, 'espresso')
+            bit = free & -free
+            free ^= bit
+            for half in ((value | bit, mask & ~bit), (value, mask & ~bit)):
+                other = (half[0] ^ bit, half[1])
+                if rest and covers(rest, other):
+                    value, mask = half
+                    break
+        result[index] = value, mask
+    return result
+
+
+def cost(on, full):
+    return len(on), literal_count(on, full)
+
+
+def espresso(on, n, dc=(), deadline=None):
+    full = (1 << n) - 1
+    if not on:
+        return []
+
+    care_set = list(on) + list(dc)
+    on = irredundant(expand(on, care_set, full, deadline), dc, deadline)
+    best = cost(on, full)
+    try:
+        while True:
+            candidate = irredundant(expand(reduce(on, dc, deadline), care_set, full, deadline), dc, deadline)
+            candidate_cost = cost(candidate, full)
+            if candidate_cost >= best:
+                return on
+            on, best = candidate, candidate_cost
+    except BudgetExceeded:
+        return on
+
+
+def minimize(node, variables, dc=(), deadline=None, max_cubes=None):
+    on = expr_to_cover(node, variables, deadline=deadline, max_cubes=max_cubes)
+    return sorted(espresso(on, len(variables), dc, deadline))
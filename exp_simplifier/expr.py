@@ -0,0 +1,483 @@
+"""
+Drzewo wyrażenia logicznego.
+
+- priorytety operatorów (od najsilniejszego):
+    - negacja (~),
+    - koniunkcja (&),
+    - alternatywa wykluczająca (^),
+    - alternatywa (|),
+    - implikacja (>), łączna prawostronnie,
+    - równoważność (=)
+- identyczne podwyrażenia są współdzielone (hash-consing), więc węzły
+  można porównywać przez tożsamość
+"""
+
+import ast
+import string
+import weakref
+
+
+class Node(object):
+    __slots__ = ('__weakref__',)
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, *args):
+        key = (cls,) + args
+        node = Node._interned.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            node._set(*args)
+            Node._interned[key] = node
+        return node
+
+    def __reduce__(self):
+        return self.__class__, self.args
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, ', '.join(map(repr, self.args)))
+
+    def __str__(self):
+        return to_string(self)
+
+    @property
+    def children(self):
+        return ()
+
+
+class Const(Node):
+    __slots__ = ('value',)
+    precedence = 7
+
+    def __new__(cls, value):
+        return super().__new__(cls, bool(value))
+
+    def _set(self, value):
+        self.value = value
+
+    @property
+    def args(self):
+        return self.value,
+
+
+class Var(Node):
+    __slots__ = ('name',)
+    precedence = 7
+
+    def _set(self, name):
+        self.name = name
+
+    @property
+    def args(self):
+        return self.name,
+
+
+class Not(Node):
+    __slots__ = ('arg',)
+    symbol = '~'
+    precedence = 6
+
+    def _set(self, arg):
+        self.arg = arg
+
+    @property
+    def args(self):
+        return self.arg,
+
+    @property
+    def children(self):
+        return self.arg,
+
+    @staticmethod
+    def combine(a, full):
+        return full ^ a
+
+
+class Binary(Node):
+    __slots__ = ('left', 'right')
+    right_assoc = False
+
+    def _set(self, left, right):
+        self.left = left
+        self.right = right
+
+    @property
+    def args(self):
+        return self.left, self.right
+
+    @property
+    def children(self):
+        return self.left, self.right
+
+
+class And(Binary):
+    __slots__ = ()
+    symbol = '&'
+    precedence = 5
+
+    @staticmethod
+    def combine(a, b, full):
+        return a & b
+
+
+class Xor(Binary):
+    __slots__ = ()
+    symbol = '^'
+    precedence = 4
+
+    @staticmethod
+    def combine(a, b, full):
+        return a ^ b
+
+
+class Or(Binary):
+    __slots__ = ()
+    symbol = '|'
+    precedence = 3
+
+    @staticmethod
+    def combine(a, b, full):
+        return a | b
+
+
+class Imp(Binary):
+    __slots__ = ()
+    symbol = '>'
+    precedence = 2
+    right_assoc = True
+
+    @staticmethod
+    def combine(a, b, full):
+        return (full ^ a) | b
+
+
+class Equ(Binary):
+    __slots__ = ()
+    symbol = '='
+    precedence = 1
+
+    @staticmethod
+    def combine(a, b, full):
+        return full ^ a ^ b
+
+
+binary_operators = {cls.symbol: cls for cls in (And, Xor, Or, Imp, Equ)}
+alphanumeric = set(string.ascii_letters + string.digits)
+
+
+def tokenize(expr):
+    tokens = []
+    i = 0
+    while i < len(expr):
+        s = expr[i]
+        if s.isspace():
+            i += 1
+        elif s in alphanumeric:
+            j = i + 1
+            while j < len(expr) and expr[j] in alphanumeric:
+                j += 1
+            tokens.append(expr[i:j])
+            i = j
+        else:
+            tokens.append(s)
+            i += 1
+    return tokens
+
+
+class _Parser(object):
+    def __init__(self, expr):
+        self.tokens = tokenize(expr)
+        self.variables = set()
+        self.operands = []
+        self.operators = []
+
+    def parse(self):
+        expect_operand = True
+        for token in self.tokens:
+            if expect_operand:
+                if token in ('~', '('):
+                    self.operators.append(token)
+                    continue
+                self.operands.append(self.atom(token))
+            elif token == ')':
+                self.reduce(1)
+                if not self.operators:
+                    raise ValueError('unexpected token %r' % token)
+                self.operators.pop()
+            else:
+                cls = binary_operators.get(token)
+                if cls is None:
+                    raise ValueError('unexpected token %r' % token)
+                self.reduce(cls.precedence + 1 if cls.right_assoc else cls.precedence)
+                self.operators.append(cls)
+                expect_operand = True
+                continue
+            while self.operators and self.operators[-1] == '~':
+                self.operators.pop()
+                self.operands.append(Not(self.operands.pop()))
+            expect_operand = False
+        if expect_operand:
+            raise ValueError('unexpected end of expression')
+        self.reduce(1)
+        if self.operators:
+            raise ValueError('missing closing parenthesis')
+        return self.operands.pop()
+
+    def reduce(self, min_precedence):
+        while self.operators and self.operators[-1] not in ('~', '(') \
+                and self.operators[-1].precedence >= min_precedence:
+            cls = self.operators.pop()
+            right = self.operands.pop()
+            self.operands.append(cls(self.operands.pop(), right))
+
+    def atom(self, token):
+        if token in ('0', '1'):
+            return Const(token == '1')
+        elif token[0].isalpha():
+            self.variables.add(token)
+            return Var(token)
+        raise ValueError('unexpected token %r' % token)
+
+
+def parse(expr):
+    parser = _Parser(expr)
+    try:
+        node = parser.parse()
+    except ValueError:
+        return None, None
+    return node, sorted(parser.variables)
+
+
+def postorder(node):
+    seen = set()
+    order = []
+    stack = [(node, False)]
+    while stack:
+        n, expanded = stack.pop()
+        if expanded:
+            order.append(n)
+        elif n not in seen:
+            seen.add(n)
+            stack.append((n, True))
+            stack.extend((c, False) for c in reversed(n.children) if c not in seen)
+    return order
+
+
+def variables_of(node):
+    return sorted(n.name for n in postorder(node) if isinstance(n, Var))
+
+
+def to_string(node):
+    text = {}
+    for n in postorder(node):
+        if isinstance(n, Var):
+            text[n] = n.name
+        elif isinstance(n, Const):
+            text[n] = '1' if n.value else '0'
+        elif isinstance(n, Not):
+            arg = text[n.arg]
+            text[n] = '~' + ('(%s)' % arg if n.arg.precedence < n.precedence else arg)
+        else:
+            left, right = text[n.left], text[n.right]
+            if n.left.precedence < n.precedence or \
+                    n.left.precedence == n.precedence and n.right_assoc:
+                left = '(%s)' % left
+            if n.right.precedence < n.precedence or \
+                    n.right.precedence == n.precedence and not n.right_assoc:
+                right = '(%s)' % right
+            text[n] = '%s %s %s' % (left, n.symbol, right)
+    return text[node]
+
+
+def evaluate_bitwise(node, values, full):
+    result = {}
+    for n in postorder(node):
+        if isinstance(n, Var):
+            result[n] = values[n.name]
+        elif isinstance(n, Const):
+            result[n] = full if n.value else 0
+        else:
+            result[n] = n.combine(*[result[c] for c in n.children], full)
+    return result[node]
+
+
+def evaluate(node, env):
+    return evaluate_bitwise(node, {k: int(bool(v)) for k, v in env.items()}, 1) == 1
+
+
+def variable_column(i, n):
+    half = 1 << (n - 1 - i)
+    column = ((1 << half) - 1) << half
+    width = 2 * half
+    while width < 1 << n:
+        column |= column << width
+        width *= 2
+    return column
+
+
+def truth_table(node, variables):
+    n = len(variables)
+    full = (1 << (1 << n)) - 1
+    columns = {v: variable_column(i, n) for i, v in enumerate(variables)}
+    return evaluate_bitwise(node, columns, full), full
+
+
+def iter_ones(table):
+    digits = bin(table)[:1:-1]
+    m = digits.find('1')
+    while m != -1:
+        yield m
+        m = digits.find('1', m + 1)
+
+
+def iter_on_set(node, variables, block=10):
+    n = len(variables)
+    k = min(n, block)
+    h = n - k
+    full = (1 << (1 << k)) - 1
+    high = variables[:h]
+    high_set = set(high)
+    values = dict.fromkeys(high, 0)
+    values.update((v, variable_column(i, k)) for i, v in enumerate(variables[h:]))
+
+    order = postorder(node)
+    depends = {}
+    for x in order:
+        if isinstance(x, Var):
+            depends[x] = frozenset([x.name]) if x.name in high_set else frozenset()
+        else:
+            depends[x] = frozenset().union(*[depends[c] for c in x.children])
+    affected = {v: [x for x in order if v in depends[x]] for v in high}
+
+    result = {}
+    for x in order:
+        if isinstance(x, Var):
+            result[x] = values[x.name]
+        elif isinstance(x, Const):
+            result[x] = full if x.value else 0
+        else:
+            result[x] = x.combine(*[result[c] for c in x.children], full)
+    yield from iter_ones(result[node])
+
+    for step in range(1, 1 << h):
+        v = high[h - (step & -step).bit_length()]
+        values[v] ^= full
+        for x in affected[v]:
+            if isinstance(x, Var):
+                result[x] = values[x.name]
+            else:
+                result[x] = x.combine(*[result[c] for c in x.children], full)
+        base = (step ^ step >> 1) << k
+        for m in iter_ones(result[node]):
+            yield base | m
+
+
+_python_operators = {
+    Not: 'not %s',
+    And: '%s and %s',
+    Xor: '%s != %s',
+    Or: '%s or %s',
+    Imp: 'not %s or %s',
+    Equ: '%s == %s',
+}
+
+
+def compile_node(node, variables):
+    names = {v: '_%d' % i for i, v in enumerate(variables)}
+    lines = []
+    for i, n in enumerate(postorder(node)):
+        if isinstance(n, Var):
+            names[n] = names[n.name]
+        elif isinstance(n, Const):
+            names[n] = repr(n.value)
+        else:
+            names[n] = 't%d' % i
+            lines.append('    t%d = bool(%s)' % (i, _python_operators[type(n)] % tuple(names[c] for c in n.children)))
+    params = ', '.join('_%d' % i for i in range(len(variables)))
+    source = 'def _compiled(%s):\n%s\n    return bool(%s)\n' % (params, '\n'.join(lines), names[node])
+    namespace = {}
+    exec(compile(source, '<expr>', 'exec'), namespace)
+    return namespace['_compiled']
+
+
+_template_operators = {'_xor': Xor, '_imp': Imp, '_equ': Equ}
+
+
+def _infix_chain(node):
+    chain = []
+    while isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        chain.append(node.right)
+        node = node.left
+    chain.append(node)
+    return chain[::-1]
+
+
+def _template_children(node):
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return [node.operand]
+    elif isinstance(node, ast.BoolOp):
+        return node.values
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return _infix_chain(node)[::2]
+    elif isinstance(node, (ast.Name, ast.Constant)):
+        return []
+    raise ValueError('unsupported template node: %s' % ast.dump(node))
+
+
+def _from_python(root):
+    nodes = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in nodes:
+            continue
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in _template_children(node))
+            continue
+        if isinstance(node, ast.Name):
+            result = Var(node.id)
+        elif isinstance(node, ast.Constant):
+            result = Const(node.value)
+        elif isinstance(node, ast.UnaryOp):
+            result = Not(nodes[id(node.operand)])
+        elif isinstance(node, ast.BoolOp):
+            cls = And if isinstance(node.op, ast.And) else Or
+            result = nodes[id(node.values[0])]
+            for v in node.values[1:]:
+                result = cls(result, nodes[id(v)])
+        else:
+            chain = _infix_chain(node)
+            result = nodes[id(chain[0])]
+            for i in range(1, len(chain), 2):
+                result = _template_operators[chain[i].id](result, nodes[id(chain[i + 1])])
+        nodes[id(node)] = result
+    return nodes[id(root)]
+
+
+def from_template(template):
+    return _from_python(ast.parse(template, mode='eval').body)
+
+
+_template_precedence = {Or: 1, And: 2, Not: 3, Xor: 4, Imp: 4, Equ: 4, Var: 5, Const: 5}
+_template_symbols = {And: 'and', Or: 'or', Xor: '| _xor |', Imp: '| _imp |', Equ: '| _equ |'}
+
+
+def to_template(node):
+    text = {}
+    for n in postorder(node):
+        level = _template_precedence[type(n)]
+        if isinstance(n, Var):
+            text[n] = n.name
+        elif isinstance(n, Const):
+            text[n] = repr(n.value)
+        elif isinstance(n, Not):
+            arg = text[n.arg]
+            text[n] = 'not ' + ('(%s)' % arg if _template_precedence[type(n.arg)] < level else arg)
+        else:
+            left, right = text[n.left], text[n.right]
+            if _template_precedence[type(n.left)] < level:
+                left = '(%s)' % left
+            if _template_precedence[type(n.right)] <= level:
+                right = '(%s)' % right
+            text[n] = '%s %s %s' % (left, _template_symbols[type(n)], right)
+    return text[node]
@@ -0,0 +1,129 @@
+"""
+Wielopoziomowa postać wyrażenia (faktoryzacja algebraiczna).
+
+- kostka pokrycia to zbiór literałów (indeks zmiennej, wartość),
+- jądra (kernels) to ilorazy pokrycia przez kostkę, które same nie mają
+  wspólnej kostki; wybierane jest jądro dające największą oszczędność
+  literałów przy dzieleniu słabym (F = Q & K | R),
+- wspólna kostka wszystkich kostek jest wyłączana przed nawias
+"""
+
+import functools
+
+from exp_simplifier.cubes import literal_count
+from exp_simplifier.expr import Const, Var, Not, And, Or, to_string
+
+
+def to_literals(cube, n):
+    value, mask = cube
+    return frozenset((i, bool(value >> (n - 1 - i) & 1)) for i in range(n) if not mask >> (n - 1 - i) & 1)
+
+
+def common_cube(cubes):
+    return frozenset.intersection(*cubes)
+
+
+def divide(cubes, divisor):
+    quotient = None
+    for d in divisor:
+        q = set(c - d for c in cubes if d <= c)
+        quotient = q if quotient is None else quotient & q
+        if not quotient:
+            return set(), list(cubes)
+    product = set(q | d for q in quotient for d in divisor)
+    return quotient, [c for c in cubes if c not in product]
+
+
+def kernels(cubes, max_kernels=256):
+    literals = sorted(set().union(*cubes))
+    common = common_cube(cubes)
+    result = {}
+
+    def find(cubes, start):
+        for i in range(start, len(literals)):
+            if len(result) >= max_kernels:
+                return
+            with_literal = [c for c in cubes if literals[i] in c]
+            if len(with_literal) < 2:
+                continue
+            common = common_cube(with_literal)
+            if any(literal in common for literal in literals[:i]):
+                continue
+            find([c - common for c in with_literal], i + 1)
+        result.setdefault(frozenset(cubes), None)
+
+    find([c - common for c in cubes], 0)
+    return [list(kernel) for kernel in result]
+
+
+def _size(cubes):
+    return sum(len(c) for c in cubes)
+
+
+def best_divisor(cubes):
+    best = None
+    best_savings = 0
+    for kernel in kernels(cubes):
+        if len(kernel) < 2:
+            continue
+        quotient, remainder = divide(cubes, kernel)
+        if quotient == {frozenset()}:
+            continue
+        savings = _size(quotient) * (len(kernel) - 1) + _size(kernel) * (len(quotient) - 1)
+        key = (savings, sorted(map(sorted, kernel)))
+        if savings > best_savings or savings == best_savings and best is not None and key < best[0]:
+            best = key, kernel, list(quotient), remainder
+            best_savings = savings
+    return None if best is None else best[1:]
+
+
+def _product(literals, variables):
+    nodes = [Var(variables[i]) if value else Not(Var(variables[i])) for i, value in sorted(literals)]
+    return functools.reduce(And, nodes) if nodes else Const(True)
+
+
+def _sum(nodes):
+    return functools.reduce(Or, nodes) if nodes else Const(False)
+
+
+def factor_cubes(cubes, variables):
+    cubes = sorted(cubes, key=sorted)
+    if frozenset() in cubes:
+        return Const(True)
+    if len(cubes) <= 1:
+        return _product(cubes[0], variables) if cubes else Const(False)
+
+    common = common_cube(cubes)
+    if common:
+        return And(_product(common, variables), factor_cubes([c - common for c in cubes], variables))
+
+    divisor = best_divisor(cubes)
+    if divisor is None:
+        return _sum([_product(c, variables) for c in cubes])
+
+    kernel, quotient, remainder = divisor
+    first, second = sorted([quotient, kernel], key=lambda part: sorted(map(sorted, part)))
+    node = And(factor_cubes(first, variables), factor_cubes(second, variables))
+    return Or(node, factor_cubes(remainder, variables)) if remainder else node
+
+
+def count_literals(node):
+    count = 0
+    stack = [node]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, Var):
+            count += 1
+        else:
+            stack.extend(x.children)
+    return count
+
+
+def factor(cover, variables):
+    n = len(variables)
+    return factor_cubes([to_literals(cube, n) for cube in cover], variables)
+
+
+def make_factored(cover, variables):
+    node = factor(cover, variables)
+    return to_string(node), literal_count(cover, (1 << len(variables)) - 1), count_literals(node)
@@ -0,0 +1,211 @@
+"""
+Przyrostowe upraszczanie kolejnych wersji wyrażenia.
+
+Simplifier pamięta tablicę prawdy, implikanty proste i pokrycie. Po zmianie
+wyrażenia porównuje tablice prawdy i aktualizuje tylko implikanty, których
+dotyczą zmienione mintermy:
+
+- implikanty pokrywające usunięte mintermy są dzielone na maksymalne
+  podkostki omijające te mintermy,
+- dodane mintermy wchodzą jako pojedyncze kostki,
+- zbiór jest domykany konsensusem, ale tylko dla par zawierających nową
+  kostkę (konsensus dwóch niezmienionych implikantów jest już pochłonięty),
+- kostki są trzymane w indeksie maska -> zbiór wartości (CubeIndex), więc
+  sprawdzenie pochłaniania kosztuje jedno wyszukiwanie na maskę zamiast
+  przeglądania wszystkich kostek, a pochłonięte kostki są usuwane w miejscu
+"""
+
+from exp_simplifier.cover import minimum_cover, prime_implicant_chart, implicant_costs
+from exp_simplifier.cubes import popcount, contains, make_sop
+from exp_simplifier.expr import parse, truth_table, iter_ones
+from exp_simplifier.validate import create_cube_groups, find_prime_implicants
+
+
+def consensus(cube1, cube2):
+    (value1, mask1), (value2, mask2) = cube1, cube2
+    conflict = (value1 ^ value2) & ~(mask1 | mask2)
+    if conflict == 0 or conflict & (conflict - 1):
+        return None
+    mask = mask1 & mask2 | conflict
+    return (value1 | value2) & ~mask, mask
+
+
+def sharp(cube, min_term):
+    value, mask = cube
+    if (min_term ^ value) & ~mask:
+        return [cube]
+    pieces = []
+    free = mask
+    while free:
+        bit = free & -free
+        free ^= bit
+        pieces.append((value | (~min_term & bit), mask & ~bit))
+    return pieces
+
+
+def _absorbed(cube, cubes):
+    return any(c != cube and contains(c, cube) for c in cubes)
+
+
+class CubeIndex(object):
+    def __init__(self, cubes=()):
+        self.masks = {}
+        self.supersets = {}
+        for cube in cubes:
+            self.add(cube)
+
+    def __contains__(self, cube):
+        return cube[0] in self.masks.get(cube[1], ())
+
+    def __iter__(self):
+        for mask, values in self.masks.items():
+            for value in values:
+                yield value, mask
+
+    def __len__(self):
+        return sum(len(values) for values in self.masks.values())
+
+    def add(self, cube):
+        values = self.masks.get(cube[1])
+        if values is None:
+            values = self.masks[cube[1]] = set()
+            self.supersets.clear()
+        values.add(cube[0])
+
+    def discard(self, cube):
+        values = self.masks.get(cube[1])
+        if values is not None:
+            values.discard(cube[0])
+            if not values:
+                self.remove_mask(cube[1])
+
+    def remove_mask(self, mask):
+        del self.masks[mask]
+        self.supersets.clear()
+
+    def containing(self, min_term):
+        return [(min_term & ~mask, mask) for mask, values in self.masks.items() if min_term & ~mask in values]
+
+    def covers(self, cube):
+        value, mask = cube
+        supersets = self.supersets.get(mask)
+        if supersets is None:
+            supersets = self.supersets[mask] = [m for m in self.masks if m != mask and m & mask == mask]
+        masks = self.masks
+        return any(value & ~m in masks[m] for m in supersets)
+
+    def remove_contained(self, cube):
+        value, mask = cube
+        for m in [m for m in self.masks if m & ~mask == 0]:
+            values = self.masks[m]
+            free = mask & ~m
+            if 1 << popcount(free) <= len(values):
+                sub = free
+                while True:
+                    values.discard(value | sub)
+                    if sub == 0:
+                        break
+                    sub = (sub - 1) & free
+            else:
+                values.difference_update([v for v in values if v & ~mask == value])
+            if not values:
+                self.remove_mask(m)
+
+    def neighbours(self, cube):
+        value, mask = cube
+        found = []
+        for m, values in self.masks.items():
+            care = ~(m | mask)
+            for v in values:
+                conflict = (v ^ value) & care
+                if conflict and not conflict & (conflict - 1):
+                    found.append((v, m))
+        return found
+
+
+def update_prime_implicants(primes, added, removed):
+    cubes = CubeIndex(primes)
+    new = set((m, 0) for m in added)
+
+    hits = {}
+    for m in removed:
+        for p in cubes.containing(m):
+            hits.setdefault(p, []).append(m)
+    for p, min_terms in hits.items():
+        cubes.discard(p)
+        pieces = [p]
+        for m in min_terms:
+            pieces = [q for piece in pieces for q in sharp(piece, m)]
+            pieces = [q for q in set(pieces) if not _absorbed(q, pieces)]
+        new.update(pieces)
+
+    for c in sorted(new, key=lambda c: -popcount(c[1])):
+        if c not in cubes and not cubes.covers(c):
+            cubes.remove_contained(c)
+            cubes.add(c)
+    work = [c for c in new if c in cubes]
+    while work:
+        c = work.pop()
+        if c not in cubes:
+            continue
+        for d in cubes.neighbours(c):
+            if d not in cubes:
+                continue
+            cons = consensus(c, d)
+            if cons is None or cons in cubes or cubes.covers(cons):
+                continue
+            cubes.remove_contained(cons)
+            cubes.add(cons)
+            work.append(cons)
+            if c not in cubes:
+                break
+
+    return set(cubes)
+
+
+class Simplifier(object):
+    def __init__(self):
+        self.variables = None
+        self.table = 0
+        self.primes = set()
+        self.cover = []
+        self.result = None
+        self.stats = {}
+
+    def simplify(self, expr):
+        node, variables = parse(expr) if expr else (None, None)
+        if node is None:
+            print('%s is not a valid logical expression' % expr)
+            return None
+
+        table, full = truth_table(node, variables)
+        if variables != self.variables:
+            self.variables = variables
+            self.table = table
+            self.primes = find_prime_implicants(create_cube_groups(iter_ones(table)))
+            self.cover = []
+            self.stats = {'full': True, 'added': popcount(table), 'removed': 0}
+        else:
+            added = table & ~self.table
+            removed = self.table & ~table
+            self.stats = {'full': False, 'added': popcount(added), 'removed': popcount(removed)}
+            if not added and not removed:
+                return self.result
+            self.primes = update_prime_implicants(self.primes, iter_ones(added), iter_ones(removed))
+            self.table = table
+
+        if table == 0 or table == full:
+            self.cover = []
+            self.result = table == full
+            return self.result
+
+        primes = sorted(self.primes)
+        ones = list(iter_ones(table))
+        position = {c: i for i, c in enumerate(primes)}
+        initial = [position[c] for c in self.cover if c in position]
+        selected = minimum_cover(prime_implicant_chart(primes, ones), implicant_costs(primes, len(variables)),
+                                 initial=initial)
+        self.cover = [primes[c] for c in selected]
+        self.result = make_sop(self.cover, variables)
+
+        return self.result
@@ -0,0 +1,66 @@
+"""
+Opcjonalne śledzenie etapów upraszczania i limity zasobów.
+
+- instrument to dowolna funkcja instrument(event, stage, counters),
+  wywoływana ze zdarzeniem 'start' i 'end' dla każdego etapu,
+- liczniki (słownik) są przekazywane przy zdarzeniu 'end',
+- zdarzenie 'degraded' oznacza przekroczenie limitu czasu lub liczby
+  mintermów w danym etapie; licznik fallback podaje użytą zamiast niego
+  metodę ('heuristic', 'greedy' albo 'unsimplified'),
+- gdy instrument jest None, etapy niczego nie mierzą ani nie liczą,
+- etapy sprawdzają limity same (check_deadline) i zgłaszają BudgetExceeded,
+- gdy wyrażenia nie udało się uprościć w ramach limitów, wynikiem jest
+  znormalizowane wyrażenie wejściowe jako Unsimplified (podklasa str),
+  co można rozpoznać także bez instrumentu
+"""
+
+import collections
+import time
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, stage):
+        super(BudgetExceeded, self).__init__('budget exceeded in %s' % stage)
+        self.stage = stage
+
+
+class Unsimplified(str):
+    pass
+
+
+def check_deadline(deadline, stage):
+    if deadline is not None and time.monotonic() > deadline:
+        raise BudgetExceeded(stage)
+
+
+def emit(instrument, event, stage, **counters):
+    if instrument is not None:
+        instrument(event, stage, counters)
+
+
+class StageRecorder(object):
+    def __init__(self):
+        self.stages = collections.OrderedDict()
+        self.events = []
+        self.degraded = []
+        self._started = {}
+
+    def __call__(self, event, stage, counters):
+        now = time.perf_counter()
+        self.events.append((event, stage, counters))
+        if event == 'start':
+            self._started[stage] = now
+        elif event == 'end':
+            record = self.stages.setdefault(stage, {'calls': 0, 'seconds': 0.0})
+            record['calls'] += 1
+            record['seconds'] += now - self._started.pop(stage, now)
+            record.update(counters)
+        elif event == 'degraded':
+            self._started.pop(stage, None)
+            self.degraded.append((stage, counters['fallback']))
+
+    def clear(self):
+        self.stages.clear()
+        del self.events[:]
+        del self.degraded[:]
+        self._started.clear()
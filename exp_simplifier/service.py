@@ -0,0 +1,95 @@
+"""
+Upraszczanie wyrażeń logicznych z kodu asyncio, w zarządzanej puli procesów roboczych.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import os
+import weakref
+
+from exp_simplifier.batch import simplify_one
+
+
+class _LoopState(object):
+    def __init__(self, max_concurrency):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.pending = {}
+
+
+class SimplifyService(object):
+    def __init__(self, workers=None, max_concurrency=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers
+        self.computed = self.coalesced = 0
+        self._executor = None
+        self._loops = weakref.WeakKeyDictionary()
+
+    def _state(self, loop):
+        state = self._loops.get(loop)
+        if state is None:
+            state = self._loops[loop] = _LoopState(self.max_concurrency)
+        return state
+
+    async def _compute(self, loop, semaphore, expr, options):
+        async with semaphore:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(self.workers)
+            self.computed += 1
+            try:
+                result = await loop.run_in_executor(self._executor, functools.partial(simplify_one, expr, **options))
+            except concurrent.futures.process.BrokenProcessPool:
+                self._executor = None
+                raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def simplify(self, expr, method='exact', max_seconds=None, max_minterms=None):
+        loop = asyncio.get_running_loop()
+        state = self._state(loop)
+        options = {'method': method, 'max_seconds': max_seconds, 'max_minterms': max_minterms}
+        key = (expr, method, max_seconds, max_minterms)
+
+        entry = state.pending.get(key)
+        if entry is None:
+            task = loop.create_task(self._compute(loop, state.semaphore, expr, options))
+            entry = state.pending[key] = [task, 0]
+            task.add_done_callback(functools.partial(self._forget, state.pending, key))
+        else:
+            self.coalesced += 1
+
+        entry[1] += 1
+        try:
+            return await asyncio.shield(entry[0])
+        except asyncio.CancelledError:
+            entry[1] -= 1
+            if entry[1] == 0:
+                if state.pending.get(key) is entry:
+                    del state.pending[key]
+                entry[0].cancel()
+            raise
+
+    @staticmethod
+    def _forget(pending, key, task):
+        entry = pending.get(key)
+        if entry is not None and entry[0] is task:
+            del pending[key]
+
+    def close(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close(wait=False)
+
+
+default_service = SimplifyService()
+
+
+async def simplify_async(expr, method='exact', max_seconds=None, max_minterms=None):
+    return await default_service.simplify(expr, method, max_seconds, max_minterms)
@@ -1,11 +1,38 @@
 import unittest
+from exp_simplifier.expr import parse, variable_column, truth_table as node_truth_table
 from exp_simplifier.validate import *
 
 
 class TestValidity(unittest.TestCase):
     def test_validate(self):
         self.assertTupleEqual(validate('(a | b) & c'), ('(a or b) and c', ['a', 'b', 'c']))
-        self.assertTupleEqual(validate('~a|1&b^(~c)'), ('not a or True and b | _xor | (not c)', ['a', 'b', 'c']))
+        self.assertTupleEqual(validate('~a|1&b^(~c)'), ('not a or (True and b) | _xor | (not c)', ['a', 'b', 'c']))
+        self.assertTupleEqual(validate('a ~ b'), (None, None))
+        self.assertTupleEqual(validate('(' * 1200 + 'a' + ')' * 1200), ('a', ['a']))
+        self.assertEqual(truth_table(*validate('~' * 1201 + 'a')), (1, 3))
+
+    def test_precedence(self):
+        for expr in ['a & b ^ c', 'a > b & c', 'a | b = c', '~a ^ b', 'a > b > c', 'a ^ b | c & ~d']:
+            node, variables = parse(expr)
+            self.assertEqual(truth_table(*validate(expr)), node_truth_table(node, variables), expr)
+            self.assertEqual(sorted(iter_min_terms(*validate(expr))), sorted(iter_on_set(node, variables)), expr)
+        self.assertTrue(compile_expr(*validate('a & b ^ c'))(False, False, True))
+        self.assertFalse(compile_expr(*validate('a > b & c'))(True, True, False))
+        self.assertTrue(compile_expr(*validate('a | b = c'))(False, False, False))
+
+    def test_compile_expr(self):
+        func = compile_expr(*validate('a > (b ^ c)'))
+        self.assertTrue(func(False, True, True))
+        self.assertTrue(func(True, True, False))
+        self.assertFalse(func(True, True, True))
+        self.assertTrue(compile_expr(*validate('1'))())
+
+    def test_truth_table(self):
+        self.assertEqual(variable_column(0, 3), 0b11110000)
+        self.assertEqual(variable_column(2, 3), 0b10101010)
+        self.assertEqual(truth_table(*validate('(a | b) & c')), (0b10101000, 0xff))
+        self.assertEqual(truth_table(*validate('a > b = (~a)')), (0b0111, 0xf))
+        self.assertEqual(truth_table(*validate('0 ^ 1')), (1, 1))
 
     def test_get_min_terms(self):
         expr = '(a | b) & c'
@@ -14,6 +41,15 @@ class TestValidity(unittest.TestCase):
                                                               ((5,), (1, 0, 1)),
                                                               ((7,), (1, 1, 1))], None))
 
+    def test_iter_min_terms(self):
+        template, variables = validate('(a | b) & c')
+        self.assertEqual(sorted(iter_min_terms(template, variables)), [3, 5, 7])
+        self.assertEqual(create_cube_groups(iter_min_terms(template, variables)),
+                         {2: {(3, 0), (5, 0)}, 3: {(7, 0)}})
+        with self.assertRaises(BudgetExceeded):
+            get_min_terms(template, variables, max_minterms=2)
+        self.assertEqual(get_min_terms(*validate('a | ~a')), ([((0,), (0,)), ((1,), (1,))], True))
+
     def test_diff_by_one(self):
         self.assertEqual(diff_by_one((1, 0, None), (1, 0, None)), (1, 0, None))
         self.assertEqual(diff_by_one((1, 0, None), (1, 1, None)), (1, None, None))
@@ -28,6 +64,29 @@ class TestValidity(unittest.TestCase):
                                                     ((8, 9), (1, 0, 0, None)),
                                                     ((8, 10), (1, 0, None, 0))})
 
+    def test_cubes(self):
+        self.assertEqual(bits_to_cube((1, None, 0, 1)), (0b1001, 0b0100))
+        self.assertEqual(cube_to_bits((0b1001, 0b0100), 4), (1, None, 0, 1))
+        self.assertEqual(cube_min_terms((0b1001, 0b0110)), [9, 11, 13, 15])
+        self.assertEqual(merge_cubes((0b1001, 0b0100), (0b1000, 0b0100)), (0b1000, 0b0101))
+        self.assertEqual(merge_cubes((0b1001, 0b0100), (0b1010, 0b0100)), None)
+        self.assertEqual(merge_cubes((0b1001, 0b0100), (0b1000, 0b0001)), None)
+
+    def test_merge_cube_groups(self):
+        groups = create_cube_groups([2, 6, 8, 9, 10, 11, 14, 15])
+        self.assertEqual(list(groups), [1, 2, 3, 4])
+        self.assertEqual(groups[1], {(2, 0), (8, 0)})
+        d = collections.OrderedDict()
+        d[1] = {(0b0010, 0b1100), (0b1000, 0b0011)}
+        d[2] = {(0b1010, 0b0101)}
+        self.assertEqual(merge_cube_groups(merge_cube_groups(groups)), d)
+
+    def test_find_prime_implicants(self):
+        groups = create_cube_groups([2, 6, 8, 9, 10, 11, 14, 15])
+        self.assertEqual(find_prime_implicants(groups), {(0b0010, 0b1100), (0b1000, 0b0011), (0b1010, 0b0101)})
+        groups = create_cube_groups([3, 4, 5, 6, 7])
+        self.assertEqual(find_prime_implicants(groups), {(0b100, 0b011), (0b011, 0b100)})
+
     def test_create_groups(self):
         self.assertEqual(collections.OrderedDict({2: {((3,), (0, 1, 1)), ((5,), (1, 0, 1))},
                                                   3: {((7,), (1, 1, 1))}}),
@@ -46,6 +105,25 @@ class TestValidity(unittest.TestCase):
         d[2] = {((10, 11, 14, 15), (1, None, 1, None))}
         self.assertEqual(ccat, d)
 
+    def test_create_prime_implicant_table(self):
+        min_terms = [((m,), None) for m in [2, 6, 8]]
+        groups = {0: [((2, 6), (0, None, 1, 0)), ((8, 9), (1, 0, 0, None)), ((2, 10), (None, 0, 1, 0))]}
+        table, merged_min_terms = create_prime_implicant_table(groups, min_terms)
+        self.assertEqual(table, collections.OrderedDict([(2, 0b101), (6, 0b001), (8, 0b010)]))
+        self.assertEqual(merged_min_terms, groups[0])
+
+    def test_get_prime_implicants(self):
+        for expr, expected in [('a | b & c', 'a'), ('a & b | ~a & ~b & c', 'a & b')]:
+            template, variables = validate(expr)
+            min_terms = get_min_terms(template, variables)[0]
+            groups = create_groups(min_terms)
+            while True:
+                merged = merge_groups(groups)
+                if not merged:
+                    break
+                groups = merged
+            self.assertEqual(make_expr(get_prime_implicants(groups, min_terms), variables), expected, expr)
+
     def test_covered_by_one(self):
         self.assertEqual(covered_by_one([1, 1, None]), -1)
         self.assertEqual(covered_by_one([1, None, None]), 0)
@@ -57,10 +135,39 @@ class TestValidity(unittest.TestCase):
         self.assertEqual(simplify('(a | b) & ~b'), 'a & ~b')
         self.assertEqual(simplify('a | ~a'), True)
         self.assertEqual(simplify('a | a'), 'a')
+        self.assertEqual(simplify('~' * 1201 + 'a'), '~a')
+        self.assertEqual(simplify('(' * 1200 + 'a' + ')' * 1200), 'a')
         self.assertEqual(simplify('a & ~a'), False)
         self.assertEqual(simplify('1'), True)
         self.assertEqual(simplify('0 | 1'), True)
         self.assertEqual(simplify('a > b'), '~a | b')
+        self.assertEqual(simplify('a | b & c'), 'b & c | a')
+
+    def test_simplify_dont_care(self):
+        self.assertEqual(simplify('a & b & ~c', dont_care='a & b & c'), 'a & b')
+        self.assertEqual(simplify('a & ~b | ~a & b', dont_care=[3]), 'b | a')
+        self.assertEqual(simplify('a & b', dont_care='~(a & b)'), True)
+        self.assertEqual(simplify('a & b', dont_care='a & b'), False)
+        self.assertEqual(simplify('a & b & ~c', method='heuristic', dont_care='a & b & c'), 'a & b')
+        self.assertIsNone(simplify('a', dont_care='a |'))
+        self.assertEqual(simplify('a & ~b', dont_care=[3, 3, 1]), 'a')
+        for dont_care in [[5], [-1], [1.0], [True], ['1']]:
+            self.assertIsNone(simplify('a', dont_care=dont_care), dont_care)
+            self.assertIsNone(simplify_multi(['a', '~a'], dont_care=dont_care), dont_care)
+        with self.assertRaises(ValueError):
+            simplify_cover(parse('a')[0], ['a'], 'heuristic', dont_care=[2])
+
+    def test_find_multi_output_primes(self):
+        groups = create_tagged_groups({2: 0b01, 3: 0b11, 7: 0b11, 4: 0b10})
+        self.assertEqual(find_multi_output_primes(groups),
+                         {(0b010, 0b001): 0b01, (0b011, 0b100): 0b11, (0b100, 0b000): 0b10})
+
+    def test_simplify_multi(self):
+        self.assertEqual(simplify_multi(['a & b & c | ~a & b', 'a & b & c | a & ~b']),
+                         ['~a & b | a & b & c', 'a & ~b | a & b & c'])
+        self.assertEqual(simplify_multi(['a | b', 'a & ~a', 'c'], dont_care='c & ~a'),
+                         ['b | a', False, 'c'])
+        self.assertIsNone(simplify_multi(['a', '(b']))
 
 
 if __name__ == '__main__':
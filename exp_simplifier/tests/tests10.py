@@ -0,0 +1,90 @@
+import time
+import unittest
+from exp_simplifier.bdd import BDD, equivalent
+from exp_simplifier.bench import random_expr
+from exp_simplifier.expr import parse
+from exp_simplifier.instrument import *
+from exp_simplifier.validate import simplify
+
+
+class TestInstrument(unittest.TestCase):
+    def test_emit(self):
+        events = []
+        emit(None, 'start', 'merge')
+        emit(lambda *event: events.append(event), 'end', 'merge', primes=3)
+        self.assertEqual(events, [('end', 'merge', {'primes': 3})])
+
+    def test_exact(self):
+        recorder = StageRecorder()
+        self.assertEqual(simplify('a | b & c | ~a & d', instrument=recorder), 'd | b & c | a')
+        self.assertEqual(list(recorder.stages), ['validate', 'min_terms', 'merge', 'cover', 'make_expr'])
+        self.assertEqual([(e, s) for e, s, _ in recorder.events[:2]], [('start', 'validate'), ('end', 'validate')])
+        self.assertEqual(recorder.stages['min_terms']['min_terms'], 13)
+        self.assertEqual(recorder.stages['merge']['rounds'], [13, 22, 12, 2])
+        self.assertEqual(recorder.stages['merge']['primes'], 3)
+        self.assertEqual((recorder.stages['cover']['rows'], recorder.stages['cover']['columns']), (13, 3))
+        self.assertEqual(recorder.stages['cover']['iterations'], 1)
+        self.assertFalse(recorder.stages['cover']['timed_out'])
+        self.assertTrue(all(stage['seconds'] >= 0 and stage['calls'] == 1 for stage in recorder.stages.values()))
+
+        recorder.clear()
+        self.assertEqual(simplify('a | ~a', instrument=recorder), True)
+        self.assertEqual(list(recorder.stages), ['validate', 'min_terms'])
+        self.assertTrue(recorder.stages['min_terms']['constant'])
+
+    def test_heuristic(self):
+        recorder = StageRecorder()
+        self.assertEqual(simplify('a | b & c', 'heuristic', instrument=recorder), 'b & c | a')
+        self.assertEqual(list(recorder.stages), ['validate', 'espresso', 'make_expr'])
+        self.assertEqual(recorder.stages['espresso']['cubes'], 2)
+
+    def test_budgets(self):
+        recorder = StageRecorder()
+        self.assertEqual(simplify('a | b & c', max_minterms=2, instrument=recorder), 'b & c | a')
+        self.assertEqual(recorder.degraded, [('min_terms', 'heuristic')])
+
+        recorder.clear()
+        self.assertEqual(simplify('a ^ b ^ c', max_minterms=2, instrument=recorder), '~a & ~b & c | ~a & b & ~c | a & ~b & ~c | a & b & c')
+        self.assertEqual(recorder.degraded, [('min_terms', 'heuristic')])
+
+        recorder.clear()
+        self.assertEqual(simplify('a ^ b ^ c', max_minterms=2, max_cubes=2, instrument=recorder), 'a ^ b ^ c')
+        self.assertEqual(recorder.degraded, [('min_terms', 'heuristic'), ('espresso', 'unsimplified')])
+
+        recorder.clear()
+        self.assertEqual(simplify('(a | b) & (c | d)', max_seconds=0, instrument=recorder), '(a | b) & (c | d)')
+        self.assertEqual(recorder.degraded, [('min_terms', 'unsimplified')])
+
+        recorder.clear()
+        self.assertEqual(simplify('a | b & c', max_seconds=60, max_minterms=100, instrument=recorder), 'b & c | a')
+        self.assertEqual(recorder.degraded, [])
+
+    def test_unsimplified(self):
+        self.assertIsInstance(simplify('a ^ b ^ c', max_minterms=2, max_cubes=2), Unsimplified)
+        self.assertNotIsInstance(simplify('a ^ b ^ c', max_minterms=2), Unsimplified)
+        self.assertIsInstance(simplify('(a | b) & (c | d)', max_seconds=0), Unsimplified)
+        self.assertNotIsInstance(simplify('a | b & c', max_seconds=60), Unsimplified)
+
+    def test_deadline_inside_stages(self):
+        for expr, method in [(' | '.join('x%d' % i for i in range(30)), 'exact'),
+                             (random_expr(64, 2), 'heuristic'), (random_expr(48, 0), 'heuristic')]:
+            start = time.monotonic()
+            self.assertTrue(equivalent(simplify(expr, method, max_seconds=0.2), expr))
+            self.assertLess(time.monotonic() - start, 2, expr)
+        with self.assertRaises(BudgetExceeded):
+            BDD(['a', 'b'], deadline=0).from_expr(parse('a & b')[0])
+
+    def test_check_deadline(self):
+        check_deadline(None, 'merge')
+        with self.assertRaises(BudgetExceeded) as context:
+            check_deadline(0, 'merge')
+        self.assertEqual(context.exception.stage, 'merge')
+
+    def test_invalid(self):
+        recorder = StageRecorder()
+        self.assertIsNone(simplify('a | ', instrument=recorder))
+        self.assertFalse(recorder.stages['validate']['valid'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from exp_simplifier.factor import *
+from exp_simplifier.bdd import equivalent
+from exp_simplifier.expr import parse
+from exp_simplifier.instrument import StageRecorder
+from exp_simplifier.validate import simplify
+
+
+def cubes(*literals):
+    return [frozenset(c) for c in literals]
+
+
+class TestFactor(unittest.TestCase):
+    a, b, c, d = (0, True), (1, True), (2, True), (3, True)
+
+    def test_to_literals(self):
+        self.assertEqual(to_literals((0b100, 0b010), 3), {(0, True), (2, False)})
+        self.assertEqual(to_literals((0b000, 0b111), 3), frozenset())
+
+    def test_divide(self):
+        a, b, c, d = self.a, self.b, self.c, self.d
+        f = cubes([a, c], [a, d], [b, c], [b, d], [c, d])
+        quotient, remainder = divide(f, cubes([a], [b]))
+        self.assertEqual(quotient, set(cubes([c], [d])))
+        self.assertEqual(remainder, cubes([c, d]))
+        self.assertEqual(divide(f, cubes([a, b])), (set(), f))
+
+    def test_kernels(self):
+        a, b, c, d = self.a, self.b, self.c, self.d
+        found = [set(k) for k in kernels(cubes([a, c], [a, d], [b, c], [b, d]))]
+        self.assertIn(set(cubes([a], [b])), found)
+        self.assertIn(set(cubes([c], [d])), found)
+        self.assertIn(set(cubes([a, c], [a, d], [b, c], [b, d])), found)
+
+    def test_factor(self):
+        variables = ['a', 'b', 'c', 'd', 'e']
+        node = factor([(0b11000, 0b00111), (0b10100, 0b01011), (0b00010, 0b11101)], variables)
+        self.assertEqual(str(node), 'a & (b | c) | d')
+        self.assertEqual(count_literals(node), 4)
+        self.assertEqual(make_factored([(0b01010, 0b10101), (0b10000, 0b01111)], variables), ('a | b & d', 3, 3))
+        self.assertEqual(count_literals(parse('(a | b) & (a | ~b)')[0]), 4)
+
+    def test_simplify_factored(self):
+        self.assertEqual(simplify('a & c | a & d | b & c | b & d | e', output='factored'), '(a | b) & (c | d) | e')
+        self.assertEqual(simplify('a | ~a', output='factored'), True)
+        expr = 'a & b & c | a & b & d | a & e | ~a & b & c'
+        self.assertTrue(equivalent(simplify(expr, output='factored'), expr))
+        with self.assertRaises(ValueError):
+            simplify('a', output='tree')
+
+        recorder = StageRecorder()
+        simplify('a & c | a & d | b & c | b & d | e', output='factored', instrument=recorder)
+        self.assertEqual((recorder.stages['factor']['sop_literals'], recorder.stages['factor']['literals']), (9, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
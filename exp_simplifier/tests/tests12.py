@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+from exp_simplifier.service import *
+from exp_simplifier.batch import InvalidExpressionError
+
+
+class TestService(unittest.TestCase):
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_simplify(self):
+        async def run():
+            async with SimplifyService(workers=2) as service:
+                results = await asyncio.gather(service.simplify('a | b & c'), service.simplify('a & ~a'),
+                                               service.simplify('a ^ b ^ c', max_minterms=2))
+                self.assertEqual(results, ['b & c | a', False, '~a & ~b & c | ~a & b & ~c | a & ~b & ~c | a & b & c'])
+                with self.assertRaises(InvalidExpressionError):
+                    await service.simplify('a | ')
+
+        self.run_async(run())
+
+    def test_coalescing(self):
+        async def run():
+            async with SimplifyService(workers=2, max_concurrency=1) as service:
+                results = await asyncio.gather(*[service.simplify('(a | b) & (a | c)') for _ in range(5)],
+                                               service.simplify('a | b'))
+                self.assertEqual(results, ['b & c | a'] * 5 + ['b | a'])
+                self.assertEqual((service.computed, service.coalesced), (2, 4))
+                self.assertEqual(await service.simplify('(a | b) & (a | c)'), 'b & c | a')
+                self.assertEqual(service.computed, 3)
+
+        self.run_async(run())
+
+    def test_cancellation(self):
+        async def run():
+            async with SimplifyService(workers=1, max_concurrency=1) as service:
+                first = asyncio.ensure_future(service.simplify('a | b', max_seconds=10))
+                second = asyncio.ensure_future(service.simplify('a & b'))
+                third = asyncio.ensure_future(service.simplify('a & b'))
+                await asyncio.sleep(0)
+                second.cancel()
+                self.assertEqual(await third, 'a & b')
+                self.assertTrue(second.cancelled())
+                self.assertEqual(await first, 'b | a')
+
+                waiter = asyncio.ensure_future(service.simplify('a | c'))
+                blocked = asyncio.ensure_future(service.simplify('a | d'))
+                await asyncio.sleep(0)
+                blocked.cancel()
+                self.assertEqual(await waiter, 'c | a')
+                self.assertTrue(blocked.cancelled())
+                self.assertEqual(service.computed, 3)
+
+        self.run_async(run())
+
+    def test_cancel_then_resubmit(self):
+        async def run():
+            async with SimplifyService(workers=1, max_concurrency=1) as service:
+                lone = asyncio.ensure_future(service.simplify('a | e'))
+                await asyncio.sleep(0)
+                lone.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await lone
+                self.assertEqual(await service.simplify('a | e'), 'e | a')
+
+        self.run_async(run())
+
+    def test_simplify_async(self):
+        self.assertEqual(self.run_async(simplify_async('~(a & b)')), '~a | ~b')
+        default_service.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import pickle
+import unittest
+from exp_simplifier.expr import *
+
+
+class TestExpr(unittest.TestCase):
+    def test_parse(self):
+        a, b, c = Var('a'), Var('b'), Var('c')
+        self.assertEqual(parse('(a | b) & c'), (And(Or(a, b), c), ['a', 'b', 'c']))
+        self.assertEqual(parse('a & b ^ c')[0], Xor(And(a, b), c))
+        self.assertEqual(parse('a | b ^ ~c')[0], Or(a, Xor(b, Not(c))))
+        self.assertEqual(parse('a > b > c')[0], Imp(a, Imp(b, c)))
+        self.assertEqual(parse('a = b > ~1')[0], Equ(a, Imp(b, Not(Const(True)))))
+        self.assertEqual(parse('x1 &  y0'), (And(Var('x1'), Var('y0')), ['x1', 'y0']))
+
+    def test_parse_invalid(self):
+        for expr in ['', 'a &', '(a | b', 'a | b)', '1a', 'a ! b', 'a b', '~', '()', 'a ~ b', ') a (', '(a) (b)']:
+            self.assertEqual(parse(expr), (None, None), expr)
+
+    def test_parse_deep(self):
+        self.assertEqual(str(parse('~' * 1201 + 'a')[0]), '~' * 1201 + 'a')
+        self.assertIs(parse('(' * 1200 + 'a' + ')' * 1200)[0], Var('a'))
+        self.assertEqual(len(postorder(parse('~(' * 1000 + 'a' + ')' * 1000)[0])), 1001)
+        node = parse(' & '.join('(a%d' % i for i in range(1200)) + ')' * 1200)[0]
+        self.assertEqual(len(postorder(node)), 2399)
+
+    def test_hash_consing(self):
+        node = parse('(a & b) | ~(a & b)')[0]
+        self.assertIs(node.left, node.right.arg)
+        self.assertIs(parse('a & b')[0], And(Var('a'), Var('b')))
+        self.assertIs(pickle.loads(pickle.dumps(node)), node)
+        self.assertEqual(len(postorder(node)), 5)
+
+    def test_to_string(self):
+        for expr in ['a & b ^ c', '(a | b) & c', 'a > b > c', '(a > b) > c', 'a & (b & c)',
+                     '~(a = b) | ~~c', 'a = (b = 0)']:
+            node = parse(expr)[0]
+            self.assertEqual(str(node), expr)
+            self.assertIs(parse(str(node))[0], node)
+
+    def test_evaluate(self):
+        node = parse('a > b ^ c')[0]
+        self.assertTrue(evaluate(node, {'a': False, 'b': False, 'c': False}))
+        self.assertTrue(evaluate(node, {'a': True, 'b': True, 'c': False}))
+        self.assertFalse(evaluate(node, {'a': True, 'b': True, 'c': True}))
+        self.assertEqual(truth_table(node, ['a', 'b', 'c']), (0b01101111, 0xff))
+
+    def test_iter_on_set(self):
+        node, variables = parse('a > b ^ c')
+        self.assertEqual(sorted(iter_on_set(node, variables)), [0, 1, 2, 3, 5, 6])
+        self.assertEqual(sorted(iter_on_set(node, variables, block=1)), [0, 1, 2, 3, 5, 6])
+        self.assertEqual(list(iter_on_set(node, variables, block=0)), [0, 1, 3, 2, 6, 5])
+        node, variables = parse('(a | ~b) & (c ^ d) | e = f & g')
+        table = truth_table(node, variables)[0]
+        for block in range(8):
+            min_terms = list(iter_on_set(node, variables, block))
+            self.assertEqual(len(min_terms), len(set(min_terms)))
+            self.assertEqual(sum(1 << m for m in min_terms), table)
+        self.assertEqual(list(iter_on_set(parse('1')[0], [])), [0])
+        self.assertEqual(list(iter_on_set(parse('a & ~a')[0], ['a'])), [])
+
+    def test_compile_node(self):
+        node, variables = parse('(a = b) & ~(a ^ c) | 0')
+        func = compile_node(node, variables)
+        for m in range(8):
+            values = [bool(m & 4), bool(m & 2), bool(m & 1)]
+            self.assertEqual(func(*values), evaluate(node, dict(zip(variables, values))))
+
+    def test_from_template(self):
+        self.assertIs(from_template('not a | _xor | b and True'),
+                      parse('~(a ^ b) & 1')[0])
+
+    def test_to_template(self):
+        self.assertEqual(to_template(parse('a & b ^ c')[0]), '(a and b) | _xor | c')
+        self.assertEqual(to_template(parse('a > b & c')[0]), 'a | _imp | (b and c)')
+        for expr in ['a | b = c', '~(a ^ b) & 1', '~a ^ b', 'a > b > c', '(a > b) > c', 'a & (b & c)', '~~a | 0']:
+            node = parse(expr)[0]
+            self.assertIs(from_template(to_template(node)), node, expr)
+
+
+if __name__ == '__main__':
+    unittest.main()
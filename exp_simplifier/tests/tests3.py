@@ -0,0 +1,73 @@
+import time
+import unittest
+from exp_simplifier.bdd import equivalent
+from exp_simplifier.bench import random_expr
+from exp_simplifier.cubes import *
+from exp_simplifier.espresso import *
+from exp_simplifier.expr import parse, truth_table
+from exp_simplifier.validate import simplify
+
+
+class TestCubes(unittest.TestCase):
+    def test_intersection(self):
+        self.assertTrue(intersects((0b100, 0b011), (0b001, 0b110)))
+        self.assertFalse(intersects((0b100, 0b011), (0b000, 0b010)))
+        self.assertEqual(intersection((0b100, 0b011), (0b001, 0b110)), (0b101, 0b010))
+        self.assertTrue(contains((0b100, 0b011), (0b101, 0b010)))
+        self.assertFalse(contains((0b101, 0b010), (0b100, 0b011)))
+
+    def test_tautology(self):
+        self.assertTrue(tautology([(0b10, 0b01), (0b00, 0b01)], 0b11))
+        self.assertTrue(tautology([(0b10, 0b00), (0b01, 0b10), (0b00, 0b01), (0b11, 0b00)], 0b11))
+        self.assertFalse(tautology([(0b10, 0b01), (0b01, 0b10)], 0b11))
+        self.assertFalse(tautology([], 0b11))
+        self.assertTrue(covers([(0b10, 0b01), (0b01, 0b10)], (0b11, 0)))
+        self.assertFalse(covers([(0b10, 0b01), (0b01, 0b10)], (0b00, 0b01)))
+
+    def test_make_sop(self):
+        self.assertEqual(make_sop([(0b100, 0b010), (0b001, 0b110)], ['a', 'b', 'c']), 'a & ~c | c')
+
+
+class TestEspresso(unittest.TestCase):
+    def test_expr_to_cover(self):
+        node, variables = parse('a ^ b')
+        self.assertEqual(sorted(expr_to_cover(node, variables)), [(0b01, 0), (0b10, 0)])
+        self.assertEqual(sorted(expr_to_cover(node, variables, False)), [(0b00, 0), (0b11, 0)])
+        node, variables = parse('~(a > b) & 1')
+        self.assertEqual(expr_to_cover(node, variables), [(0b10, 0)])
+        self.assertEqual(expr_to_cover(*parse('a & ~a')), [])
+
+    def test_minimize(self):
+        node, variables = parse('a & b | a & ~b | ~a & b & c')
+        self.assertEqual(minimize(node, variables), [(0b011, 0b100), (0b100, 0b011)])
+
+    def test_equivalence(self):
+        for expr in ['(a ^ b) | (c = d) & ~a', 'a > (b > (c > d))', '(a | b) & (c | d) & (a | c)',
+                     'a & b ^ c & d ^ a']:
+            node, variables = parse(expr)
+            result = simplify(expr, method='heuristic')
+            self.assertEqual(truth_table(parse(result)[0], variables), truth_table(node, variables), expr)
+
+    def test_simplify_heuristic(self):
+        self.assertEqual(simplify('a | ~a', method='heuristic'), True)
+        self.assertEqual(simplify('a & ~a', method='heuristic'), False)
+        self.assertEqual(simplify('(a | b) & ~b', method='heuristic'), 'a & ~b')
+        variables = ['x%d' % i for i in range(48)]
+        expr = ' | '.join('%s & %s' % (variables[i], variables[i + 1]) for i in range(0, 48, 2))
+        self.assertEqual(simplify('(%s) & (x0 | ~x0)' % expr, method='heuristic').count('|'), 23)
+
+    def test_bounded(self):
+        for n, seed in [(40, 1), (64, 2)]:
+            expr = random_expr(n, seed)
+            start = time.monotonic()
+            result = simplify(expr, method='heuristic')
+            self.assertLess(time.monotonic() - start, MAX_SECONDS + 5, expr)
+            self.assertTrue(equivalent(result, expr), expr)
+        on = [(0b110, 0b000), (0b111, 0b000), (0b011, 0b100)]
+        with self.assertRaises(BudgetExceeded):
+            espresso(on, 3, deadline=time.monotonic())
+        self.assertEqual(espresso(on, 3, deadline=time.monotonic() + 60), [(0b011, 0b100), (0b110, 0b001)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from exp_simplifier.cover import *
+from exp_simplifier.validate import simplify
+
+
+class TestCover(unittest.TestCase):
+    def test_prime_implicant_chart(self):
+        cubes = [(0b0010, 0b1100), (0b1000, 0b0011), (0b1010, 0b0101)]
+        self.assertEqual(prime_implicant_chart(cubes, [2, 6, 8, 9, 10, 11, 14, 15]),
+                         [0b001, 0b001, 0b010, 0b010, 0b111, 0b110, 0b101, 0b100])
+        self.assertEqual(implicant_costs(cubes, 4), [7, 7, 7])
+
+    def test_reduce_chart(self):
+        rows, cols, selected = reduce_chart([0b001, 0b011, 0b110], 0b111, [1, 1, 1])
+        self.assertEqual((rows, selected), ([], [0, 1]))
+        rows, cols, selected = reduce_chart([0b011, 0b110, 0b101], 0b111, [1, 1, 1])
+        self.assertEqual((sorted(rows), cols, selected), ([0b011, 0b101, 0b110], 0b111, []))
+        rows, cols, selected = reduce_chart([0b011, 0b111], 0b111, [2, 1, 1])
+        self.assertEqual((rows, selected), ([], [1]))
+
+    def test_minimum_cover(self):
+        rows = [0b000011, 0b000110, 0b001100, 0b011000, 0b110000, 0b100001]
+        self.assertEqual(len(minimum_cover(rows, [1] * 6)), 3)
+        self.assertEqual(minimum_cover(rows, [1, 2, 1, 2, 1, 2]), [0, 2, 4])
+        self.assertEqual(minimum_cover([], []), [])
+
+    def test_uncovered_rows(self):
+        stats = {}
+        self.assertEqual(minimum_cover([0b1, 0], [1], stats=stats), [0])
+        self.assertEqual(stats['uncovered'], 1)
+        self.assertEqual(minimum_cover([0, 0], []), [])
+        self.assertEqual(greedy_cover([0b01, 0b10], 0b01, [1, 1]), [0])
+
+    def test_time_budget(self):
+        rows = [1 << i | 1 << ((i + 1) % 40) for i in range(40)]
+        cover = minimum_cover(rows, [1] * 40, max_seconds=0)
+        self.assertTrue(all(any(r >> c & 1 for c in cover) for r in rows))
+
+    def test_cyclic_simplify(self):
+        self.assertEqual(simplify('a ^ b | b ^ c').count('|'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
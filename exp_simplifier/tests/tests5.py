@@ -0,0 +1,54 @@
+import time
+import unittest
+from exp_simplifier.bench import random_expr
+from exp_simplifier.cache import *
+
+
+class TestCache(unittest.TestCase):
+    def test_text_hit(self):
+        cache = SimplifyCache()
+        self.assertEqual(cache.simplify('a | b & c'), 'b & c | a')
+        self.assertEqual(cache.simplify(' a|b  &c '), 'b & c | a')
+        self.assertEqual(cache.info(), CacheInfo(1, 0, 1, 1024, 1))
+        self.assertEqual(cache.simplify('ab | c'), 'c | ab')
+        self.assertIsNone(cache.simplify('a b | c'))
+
+    def test_table_hit(self):
+        cache = SimplifyCache()
+        self.assertEqual(cache.simplify('a & b | c'), 'c | a & b')
+        self.assertEqual(cache.simplify('c | b & a'), 'c | a & b')
+        self.assertEqual(cache.simplify('x & y | z'), 'z | x & y')
+        self.assertEqual(cache.simplify('b | a & c'), 'b | a & c')
+        self.assertEqual(cache.simplify('p | ~p'), True)
+        self.assertEqual(cache.simplify('q | ~q'), True)
+        self.assertEqual(cache.info(), CacheInfo(0, 4, 2, 1024, 6))
+
+    def test_bounds(self):
+        cache = SimplifyCache(maxsize=2)
+        for expr in ['a', 'a & b', 'a | b', 'a']:
+            cache.simplify(expr)
+        self.assertEqual(cache.info(), CacheInfo(0, 0, 4, 2, 2))
+        cache = SimplifyCache(ttl=0.01)
+        cache.simplify('a & b')
+        time.sleep(0.02)
+        cache.simplify('a & b')
+        self.assertEqual(cache.info().misses, 2)
+        cache.clear()
+        self.assertEqual(cache.info(), CacheInfo(0, 0, 0, 1024, 0))
+
+    def test_invalid(self):
+        self.assertIsNone(SimplifyCache().simplify(''))
+
+    def test_unsimplified(self):
+        cache = SimplifyCache()
+        expr = random_expr(64, 2)
+        self.assertIsInstance(cache.simplify(expr, 'heuristic'), Unsimplified)
+        self.assertEqual(cache.info().currsize, 0)
+
+    def test_permute_cube(self):
+        self.assertEqual(permute_cube((0b100, 0b001), ['a', 'b', 'c'], ['c', 'a', 'b']), (0b010, 0b100))
+        self.assertEqual(canonical_order(0b11101010, ['a', 'b', 'c']), ['a', 'b', 'c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
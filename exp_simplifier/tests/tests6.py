@@ -0,0 +1,76 @@
+import argparse
+import io
+import unittest
+from exp_simplifier.batch import *
+
+
+class TestBatch(unittest.TestCase):
+    exprs = ['a | b', '(a | b) & ~b', 'a & ~a', 'a &', '', 'a > b', 'a | b & c']
+    expected = ['b | a', 'a & ~b', False, InvalidExpressionError, InvalidExpressionError, '~a | b', 'b & c | a']
+
+    def check(self, results):
+        self.assertEqual(len(results), len(self.expected))
+        for result, expected in zip(results, self.expected):
+            if isinstance(expected, type):
+                self.assertIsInstance(result, expected)
+            else:
+                self.assertEqual(result, expected)
+
+    def test_simplify_one(self):
+        self.assertEqual(simplify_one('a | ~a'), True)
+        self.assertIsInstance(simplify_one('a | ~a', method='unknown'), ValueError)
+        self.assertIsInstance(simplify_one('a | b', max_seconds='1'), TypeError)
+
+    def test_invalid_items(self):
+        results = simplify_many(['a | b', 5, None], workers=1)
+        self.assertEqual(results[0], 'b | a')
+        self.assertIsInstance(results[1], TypeError)
+        self.assertIsInstance(results[2], InvalidExpressionError)
+        record = simplify_record(5)
+        self.assertEqual((record['simplified'], record['variables']), (None, None))
+        self.assertIn('error', record)
+
+    def test_inline(self):
+        self.check(simplify_many(self.exprs, workers=1))
+        self.check(simplify_many(self.exprs, workers=1, max_seconds=60, max_minterms=100))
+
+    def test_process_pool(self):
+        self.check(simplify_many(self.exprs, workers=2, chunksize=2))
+        self.check(list(iter_simplify(iter(self.exprs), workers=2, chunksize=1, prefetch=1)))
+        results = simplify_many(['a | b', 'a & b'], workers=2, max_seconds='1')
+        self.assertEqual([type(r) for r in results], [TypeError, TypeError])
+
+    def test_chunksize(self):
+        for chunksize in [0, -1]:
+            with self.assertRaises(ValueError):
+                iter_simplify(self.exprs, workers=2, chunksize=chunksize)
+        self.assertEqual(positive_int('3'), 3)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            positive_int('0')
+
+    def test_workers_option(self):
+        self.assertEqual(setup_parser().parse_args(['-', '-w', '0']).workers, 0)
+        self.assertEqual(non_negative_int('4'), 4)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            non_negative_int('-1')
+
+    def test_simplify_record(self):
+        record = simplify_record('a | b & c')
+        self.assertGreaterEqual(record.pop('seconds'), 0)
+        self.assertEqual(record, {'input': 'a | b & c', 'simplified': 'b & c | a', 'variables': ['a', 'b', 'c']})
+        record = simplify_record('a | (b')
+        self.assertEqual((record['simplified'], record['variables']), (None, None))
+        self.assertIn('error', record)
+        record = simplify_record('a ^ b ^ c ^ d', max_minterms=4)
+        self.assertEqual(record['simplified'].count('|'), 7)
+        self.assertEqual(record['degraded'], [('min_terms', 'heuristic')])
+        record = simplify_record('(a | b) & (c | d)', max_seconds=0)
+        self.assertEqual(record['simplified'], '(a | b) & (c | d)')
+        self.assertEqual(record['degraded'], [('min_terms', 'unsimplified')])
+
+    def test_read_expressions(self):
+        self.assertEqual(list(read_expressions(io.StringIO('a | b\n\n  ~c \n'))), ['a | b', '~c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from exp_simplifier.bdd import *
+from exp_simplifier.validate import simplify
+
+
+class TestBDD(unittest.TestCase):
+    def test_canonical(self):
+        manager = BDD(['a', 'b', 'c'])
+        u = manager.from_expr(parse('a & (b | c)')[0])
+        v = manager.from_expr(parse('a & b | c & a')[0])
+        self.assertEqual(u, v)
+        self.assertEqual(manager.size(u), 5)
+        self.assertEqual(manager.from_expr(parse('(a > b) = (~b > ~a)')[0]), TRUE)
+        self.assertEqual(manager.apply('xor', u, u), FALSE)
+
+    def test_order_variables(self):
+        node = parse('c & b | a & c | a')[0]
+        self.assertEqual(order_variables(node), ['c', 'b', 'a'])
+        self.assertEqual(order_variables(node, 'sorted'), ['a', 'b', 'c'])
+        self.assertEqual(order_variables(node, 'frequency'), ['c', 'a', 'b'])
+        self.assertRaises(ValueError, order_variables, node, 'random')
+
+    def test_queries(self):
+        self.assertTrue(is_tautology('a | ~a'))
+        self.assertFalse(is_tautology('a | b'))
+        self.assertTrue(is_contradiction('(a = b) & (a ^ b)'))
+        self.assertTrue(equivalent('a > b', '~a | b'))
+        self.assertFalse(equivalent('a > b', 'b > a'))
+        self.assertEqual(count_models('a | b & c'), 5)
+        self.assertEqual(count_models('1'), 1)
+        self.assertEqual(min_terms('(a | b) & c'), ([3, 5, 7], ['a', 'b', 'c']))
+        self.assertRaises(ValueError, is_tautology, 'a &')
+
+    def test_cubes(self):
+        manager, u = build(parse('a | b')[0])
+        self.assertEqual(sorted(manager.cubes(u)), [(0b01, 0b00), (0b10, 0b01)])
+        self.assertEqual(sorted(manager.minterms(u, ['b', 'a'])), [1, 2, 3])
+
+    def test_large_constant(self):
+        chain = ' ^ '.join('x%d' % i for i in range(64))
+        self.assertEqual(simplify('(%s) | ~(%s)' % (chain, chain)), True)
+        self.assertEqual(count_models(chain), 2 ** 63)
+
+
+if __name__ == '__main__':
+    unittest.main()
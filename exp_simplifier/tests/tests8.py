@@ -0,0 +1,67 @@
+import random
+import unittest
+from exp_simplifier.expr import iter_ones
+from exp_simplifier.incremental import *
+from exp_simplifier.validate import create_cube_groups, find_prime_implicants
+
+
+class TestIncremental(unittest.TestCase):
+    def test_consensus(self):
+        self.assertEqual(consensus((0b100, 0b010), (0b001, 0b100)), (0b100, 0b001))
+        self.assertIsNone(consensus((0b110, 0b000), (0b001, 0b000)))
+        self.assertIsNone(consensus((0b100, 0b011), (0b100, 0b001)))
+
+    def test_sharp(self):
+        self.assertEqual(sorted(sharp((0b100, 0b011), 0b101)), [(0b100, 0b010), (0b110, 0b001)])
+        self.assertEqual(sharp((0b100, 0b011), 0b001), [(0b100, 0b011)])
+
+    def test_update_prime_implicants(self):
+        primes = {(0b100, 0b011)}
+        self.assertEqual(update_prime_implicants(primes, [0b011], [0b111]),
+                         {(0b100, 0b010), (0b100, 0b001), (0b011, 0b000)})
+        self.assertEqual(update_prime_implicants(primes, [], []), primes)
+        self.assertEqual(update_prime_implicants({(0b100, 0b011)}, [0b001, 0b010, 0b011], []),
+                         {(0b100, 0b011), (0b001, 0b110), (0b010, 0b101)})
+
+    def test_update_matches_recompute(self):
+        rng = random.Random(0)
+        for n in [3, 5, 7]:
+            table = rng.getrandbits(1 << n)
+            primes = find_prime_implicants(create_cube_groups(iter_ones(table)))
+            for _ in range(10):
+                changed = 0
+                for _ in range(rng.choice([1, 3, 1 << n - 2])):
+                    changed |= 1 << rng.randrange(1 << n)
+                added, removed = changed & ~table, changed & table
+                table ^= changed
+                primes = update_prime_implicants(primes, iter_ones(added), iter_ones(removed))
+                self.assertEqual(primes, find_prime_implicants(create_cube_groups(iter_ones(table))), (n, table))
+
+    def test_cube_index(self):
+        index = CubeIndex([(0b100, 0b011), (0b011, 0b000), (0b000, 0b110)])
+        self.assertEqual(len(index), 3)
+        self.assertIn((0b011, 0b000), index)
+        self.assertEqual(sorted(index.containing(0b101)), [(0b100, 0b011)])
+        self.assertTrue(index.covers((0b101, 0b000)))
+        self.assertFalse(index.covers((0b100, 0b011)))
+        self.assertEqual(sorted(index.neighbours((0b011, 0b000))), [(0b000, 0b110), (0b100, 0b011)])
+        index.remove_contained((0b000, 0b111))
+        self.assertEqual(len(index), 0)
+
+    def test_simplifier(self):
+        simplifier = Simplifier()
+        self.assertEqual(simplifier.simplify('a | b & c'), 'b & c | a')
+        self.assertTrue(simplifier.stats['full'])
+        self.assertEqual(simplifier.simplify('c & b | a'), 'b & c | a')
+        self.assertEqual(simplifier.stats, {'full': False, 'added': 0, 'removed': 0})
+        self.assertEqual(simplifier.simplify('a & ~b | b & c'), 'b & c | a & ~b')
+        self.assertEqual(simplifier.stats, {'full': False, 'added': 0, 'removed': 1})
+        self.assertEqual(simplifier.simplify('a & ~b | b & c | ~c & b'), 'b | a')
+        self.assertEqual(simplifier.simplify('a & ~a & (b | c)'), False)
+        self.assertEqual(simplifier.simplify('a | b | c | ~a'), True)
+        self.assertEqual(simplifier.simplify('a | c & ~b'), '~b & c | a')
+        self.assertIsNone(simplifier.simplify('a | '))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from exp_simplifier.bench import *
+from exp_simplifier.bdd import equivalent
+from exp_simplifier.expr import parse
+
+
+class TestBench(unittest.TestCase):
+    def test_families(self):
+        self.assertEqual(parity_expr(3), 'x00 ^ x01 ^ x02')
+        self.assertTrue(equivalent(mux_expr(3), '~s00 & d00 | s00 & d01'))
+        self.assertTrue(equivalent(adder_expr(4), 'a01 & b01 | (a01 | b01) & a00 & b00'))
+        self.assertEqual(random_expr(6), random_expr(6))
+        for n in [4, 8, 12]:
+            self.assertEqual(len(parse(random_expr(n))[1]), n)
+            self.assertEqual(len(parse(parity_expr(n))[1]), n)
+            self.assertLessEqual(len(parse(mux_expr(n))[1]), n)
+            self.assertEqual(len(parse(adder_expr(n))[1]), n)
+
+    def test_run_case(self):
+        record = run_case('parity', 4, repeat=1)
+        self.assertEqual(list(record['stages']), STAGES)
+        self.assertEqual((record['variables'], record['minterms'], record['primes'], record['cover']), (4, 8, 8, 8))
+        self.assertGreater(record['peak_bytes'], 0)
+
+        record = run_case('parity', 8, repeat=1, max_minterms=100)
+        self.assertEqual(record['skipped'], 'minterms')
+        self.assertEqual(list(record['stages']), ['validate', 'min_terms'])
+
+    def test_run_incremental(self):
+        record = run_incremental('random', 12, edits=3, free=2)
+        self.assertEqual((record['size'], record['edits'], record['free']), (12, 3, 2))
+        self.assertLess(record['incremental'], record['fresh'])
+
+    def test_run(self):
+        report = run(['mux', 'adder'], [4], repeat=1)
+        self.assertEqual([(r['family'], r['size']) for r in report['results']], [('mux', 4), ('adder', 4)])
+        self.assertEqual(report['repeat'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
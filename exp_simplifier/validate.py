@@ -11,13 +11,27 @@ Jakub Starzyk
 - zmienne:
     - ciąg znaków alfanumerycznych
     - nie powinna zaczynać się cyfrą
+- priorytety (od najsilniejszego): ~, &, ^, |, > (łączna prawostronnie), =,
+  tak samo jak w exp_simplifier.expr; validate zwraca szablon Pythona
+  z nawiasami zachowującymi te priorytety, więc truth_table, get_min_terms
+  i compile_expr liczą to samo wyrażenie co parse i simplify
 """
 
+import functools
 import string
+import time
 from functools import partial
 
 import collections
 
+from exp_simplifier import bdd, espresso
+from exp_simplifier.factor import make_factored
+from exp_simplifier.cover import minimum_cover, prime_implicant_chart, implicant_costs
+from exp_simplifier.cubes import popcount, bits_to_cube, cube_to_bits, cube_min_terms, merge_cubes, make_sop
+from exp_simplifier.expr import Node, And, parse, from_template, compile_node, truth_table as node_truth_table, \
+    iter_on_set, to_string, to_template
+from exp_simplifier.instrument import BudgetExceeded, Unsimplified, check_deadline, emit
+
 
 class Infix(object):
     def __init__(self, func):
@@ -76,8 +90,6 @@ def consume_variable(expr, i):
 def validate(expr):
     state = 'S1'
     parens = 0
-    template = ''
-    variables = set()
 
     i = 0
     while i < len(expr):
@@ -87,75 +99,66 @@ def validate(expr):
             continue
         if state == 'S1':
             if s == '(':
-                template += s
                 parens += 1
                 i += 1
             elif s == '~':
-                template += 'not '
                 i += 1
             else:
                 var, i = consume_variable(expr, i)
                 if is_variable(var):
                     state = 'S2'
-                    if var == '1':
-                        var = 'True'
-                    elif var == '0':
-                        var = 'False'
-                    else:
-                        variables.add(var)
-                    template += var
                 else:
                     return None, None
         elif state == 'S2':
             if s == ')':
-                template += s
                 parens -= 1
                 i += 1
+            elif s in operators and s != '~':
+                state = 'S1'
+                i += 1
             else:
-                try:
-                    pos = operators.index(s)
-                    inf = ''
-                    op = operators[pos]
-                    if op == '&':
-                        inf = ' and '
-                    elif op == '|':
-                        inf = ' or '
-                    elif op == '^':
-                        inf = ' | _xor | '
-                    elif op == '~':
-                        inf = 'not '
-                    elif op == '>':
-                        inf = ' | _imp | '
-                    elif op == '=':
-                        inf = ' | _equ | '
-                    template += inf
-                    state = 'S1'
-                    i += 1
-                except ValueError:
-                    return None, None
+                return None, None
         if parens < 0:
             return None, None
-    if parens == 0 and state == 'S2':
-        return template, sorted(variables)
-    else:
+    if parens != 0 or state != 'S2':
         return None, None
+    node, variables = parse(expr)
+    if node is None:
+        return None, None
+    return to_template(node), variables
 
 
-def get_min_terms(template, variables):
-    min_terms = []
+def _as_node(template):
+    return from_template(template) if isinstance(template, str) else template
 
-    i = 0
-    for m in range(2 ** len(variables)):
-        bins = [int(d) for d in format(m, '0%db' % len(variables))]
-        values = [d == 1 for d in bins]
-        _globals = {'_xor': _xor, '_imp': _imp, '_equ': _equ}
-        if eval(template, _globals, dict(zip(variables, values))):
-            min_terms.append(((m,), tuple(bins)))
-            i += 1
 
-    if i == 0:
+def compile_expr(template, variables):
+    return compile_node(_as_node(template), variables)
+
+
+def truth_table(template, variables):
+    return node_truth_table(_as_node(template), variables)
+
+
+def iter_min_terms(template, variables, max_minterms=None):
+    count = 0
+    for m in iter_on_set(_as_node(template), variables):
+        count += 1
+        if max_minterms is not None and count > max_minterms:
+            raise BudgetExceeded('min_terms')
+        yield m
+
+
+def get_min_terms(template, variables, max_minterms=None):
+    n = len(variables)
+    ones = sorted(iter_min_terms(template, variables, max_minterms))
+
+    min_terms = [((m,), tuple(map(int, format(m, '0%db' % n))) if n else ())
+                 for m in ones]
+
+    if not ones:
         always_evaluates_to = False
-    elif i == 2 ** len(variables):
+    elif len(ones) == 1 << n:
         always_evaluates_to = True
     else:
         always_evaluates_to = None
@@ -164,23 +167,102 @@ def get_min_terms(template, variables):
 
 
 def diff_by_one(bits1, bits2):
-    len_bits = len(bits1)
-    diffs = 0
-    res = []
+    cube = merge_cubes(bits_to_cube(bits1), bits_to_cube(bits2))
+    return None if cube is None else cube_to_bits(cube, len(bits1))
 
-    for i in range(len_bits):
-        if (bits1[i] is None) | _xor | (bits2[i] is None):
-            return None
-        else:
-            if bits1[i] != bits2[i]:
-                diffs += 1
-                res.append(None)
-            else:
-                res.append(bits1[i])
-            if diffs > 1:
-                return None
 
-    return tuple(res)
+def create_cube_groups(min_terms):
+    groups = dict()
+
+    for m in min_terms:
+        groups.setdefault(popcount(m), set()).add((m, 0))
+
+    return collections.OrderedDict(sorted(groups.items()))
+
+
+def merge_cube_groups(groups, combined=None, deadline=None):
+    result = collections.OrderedDict()
+
+    for k, group in groups.items():
+        check_deadline(deadline, 'merge')
+        lower = groups.get(k - 1)
+        if not lower:
+            continue
+        merged = set()
+        for value, mask in group:
+            ones = value
+            while ones:
+                bit = ones & -ones
+                ones ^= bit
+                partner = (value ^ bit, mask)
+                if partner in lower:
+                    merged.add((value ^ bit, mask | bit))
+                    if combined is not None:
+                        combined.add(partner)
+                        combined.add((value, mask))
+        if merged:
+            result[k - 1] = merged
+
+    return result
+
+
+def find_prime_implicants(groups, rounds=None, deadline=None):
+    primes = set()
+
+    while groups:
+        if rounds is not None:
+            rounds.append(sum(len(group) for group in groups.values()))
+        combined = set()
+        merged = merge_cube_groups(groups, combined, deadline)
+        for group in groups.values():
+            primes.update(group - combined)
+        groups = merged
+
+    return primes
+
+
+def create_tagged_groups(tags):
+    groups = dict()
+
+    for m, tag in tags.items():
+        groups.setdefault(popcount(m), dict())[(m, 0)] = tag
+
+    return collections.OrderedDict(sorted(groups.items()))
+
+
+def find_multi_output_primes(groups):
+    primes = dict()
+
+    while groups:
+        merged_groups = collections.OrderedDict()
+        absorbed = set()
+        for k, group in groups.items():
+            lower = groups.get(k - 1)
+            if not lower:
+                continue
+            merged = dict()
+            for (value, mask), tag in group.items():
+                ones = value
+                while ones:
+                    bit = ones & -ones
+                    ones ^= bit
+                    partner = (value ^ bit, mask)
+                    common = tag & lower.get(partner, 0)
+                    if common:
+                        merged[(value ^ bit, mask | bit)] = common
+                        if common == tag:
+                            absorbed.add((value, mask))
+                        if common == lower[partner]:
+                            absorbed.add(partner)
+            if merged:
+                merged_groups[k - 1] = merged
+        for group in groups.values():
+            for cube, tag in group.items():
+                if cube not in absorbed:
+                    primes[cube] = tag
+        groups = merged_groups
+
+    return primes
 
 
 def create_groups(min_terms):
@@ -197,22 +279,23 @@ def create_groups(min_terms):
 def merge_two_groups(g1, g2):
     result = set()
 
+    cubes2 = [(bits_to_cube(mt2[1]), mt2[0]) for mt2 in g2]
     for mt1 in g1:
-        bits1 = mt1[1]
-        for mt2 in g2:
-            bits2 = mt2[1]
-            bits = diff_by_one(bits1, bits2)
-            if bits:
-                result.add((tuple(sorted(mt1[0] + mt2[0])), bits))
+        cube1 = bits_to_cube(mt1[1])
+        for cube2, min_terms2 in cubes2:
+            cube = merge_cubes(cube1, cube2)
+            if cube is not None:
+                result.add((tuple(sorted(mt1[0] + min_terms2)), cube_to_bits(cube, len(mt1[1]))))
 
     return result
 
 
-def merge_groups(groups):
+def merge_groups(groups, deadline=None):
     result = collections.OrderedDict()
 
     keys = list(groups)
     for i in range(len(keys) - 1):
+        check_deadline(deadline, 'merge')
         res = merge_two_groups(groups[keys[i]], groups[keys[i + 1]])
         if res:
             result[keys[i]] = res
@@ -226,20 +309,13 @@ def create_prime_implicant_table(groups, sv_min_terms):
         for min_term in group:
             merged_min_terms.append(min_term)
 
-    pi_table = collections.OrderedDict()
+    pi_table = collections.OrderedDict((sv_min_term[0][0], 0) for sv_min_term in sv_min_terms)
 
-    for sv_min_term in sv_min_terms:
-        covers_min_term = []
-        sv_min_term_val = sv_min_term[0][0]
-        covers_n = 0
-        for min_term in merged_min_terms:
-            if sv_min_term_val in min_term[0]:
-                covers_min_term.append(1)
-                covers_n += 1
-            else:
-                covers_min_term.append(None)
-        pi_table.setdefault(sv_min_term_val, [])
-        pi_table[sv_min_term_val] = covers_min_term
+    for column, min_term in enumerate(merged_min_terms):
+        bit = 1 << column
+        for m in min_term[0]:
+            if m in pi_table:
+                pi_table[m] |= bit
 
     return pi_table, merged_min_terms
 
@@ -256,81 +332,251 @@ def covered_by_one(min_term):
     return r
 
 
-def get_prime_implicants(groups, min_terms):
-    out = []
-
+def get_prime_implicants(groups, min_terms, max_seconds=None):
     table, merged_min_terms = create_prime_implicant_table(groups, min_terms)
-    while len(table) > 0:
-        pi = None
-        app = None
-
-        for t in table.items():
-            pi = covered_by_one(t[1])
-            if pi != -1:
-                app = merged_min_terms.pop(pi)
-                out.append(app)
-                break
 
-        if pi is None or app is None:
-            return out
+    costs = implicant_costs([bits_to_cube(mt[1]) for mt in merged_min_terms], len(min_terms[0][1]) if min_terms else 0)
 
-        del_mt = app[0]
-        for mt in del_mt:
-            if mt in table.keys():
-                table.pop(mt)
-
-        for t in table.items():
-            t[1].pop(pi)
-
-    return out
+    return [merged_min_terms[c] for c in minimum_cover(list(table.values()), costs, max_seconds)]
 
 
 def make_expr(prime_implicants, variables):
-    or_joined = []
-    for p in prime_implicants:
-        and_joined = []
-        bits = p[1]
-        for i in range(len(bits)):
-            if bits[i] is None:
+    return make_sop([bits_to_cube(p[1]) for p in prime_implicants], variables)
+
+
+def _dont_care_min_terms(dont_care, variables):
+    if dont_care is None or isinstance(dont_care, Node):
+        return dont_care
+    full = 1 << len(variables)
+    min_terms = set()
+    for m in dont_care:
+        if not isinstance(m, int) or isinstance(m, bool) or not 0 <= m < full:
+            raise ValueError('invalid don\'t-care minterm: %r' % (m,))
+        min_terms.add(m)
+    return sorted(min_terms)
+
+
+def _dont_care_cover(dont_care, variables, deadline=None, max_cubes=None):
+    if dont_care is None:
+        return []
+    elif isinstance(dont_care, Node):
+        return espresso.expr_to_cover(dont_care, variables, deadline=deadline, max_cubes=max_cubes)
+    return [(m, 0) for m in dont_care]
+
+
+def _exact_sets(nodes, variables, dont_care, max_minterms=None, deadline=None):
+    if isinstance(dont_care, Node):
+        manager = bdd.BDD(bdd.order_variables(functools.reduce(And, nodes + [dont_care])), deadline)
+        dc_root = manager.from_expr(dont_care)
+        if dc_root == bdd.TRUE:
+            return [True] * len(nodes)
+    else:
+        manager = bdd.BDD(bdd.order_variables(functools.reduce(And, nodes)), deadline)
+        dc_root = None
+
+    full = 1 << len(variables)
+    if dc_root is not None and max_minterms is not None and manager.sat_count(dc_root) > max_minterms:
+        raise BudgetExceeded('min_terms')
+    dc_min_terms = set(dont_care or ()) if dc_root is None else set(manager.minterms(dc_root, variables))
+    sets = []
+    for node in nodes:
+        root = manager.from_expr(node)
+        if dc_root is not None:
+            if manager.apply('or', root, dc_root) == bdd.TRUE:
+                sets.append(True)
                 continue
-            elif bits[i] == 0:
-                and_joined.append('~' + variables[i])
-            elif bits[i] == 1:
-                and_joined.append(variables[i])
-        or_joined.append(' & '.join(and_joined))
+            root = manager.apply('and', root, manager.neg(dc_root))
+        elif root == bdd.TRUE:
+            sets.append(True)
+            continue
+        if root == bdd.FALSE:
+            sets.append(False)
+            continue
+        if max_minterms is not None and manager.sat_count(root) > max_minterms:
+            raise BudgetExceeded('min_terms')
+        ones = sorted(set(manager.minterms(root, variables)).difference(dc_min_terms))
+        if not ones:
+            sets.append(False)
+        elif len(ones) + len(dc_min_terms) == full:
+            sets.append(True)
+        else:
+            sets.append((ones, sorted(dc_min_terms)))
+
+    return sets
+
+
+def _heuristic_cover(node, variables, dont_care, instrument, deadline, max_cubes):
+    if deadline is None:
+        deadline = time.monotonic() + espresso.MAX_SECONDS
+    if max_cubes is None:
+        max_cubes = espresso.MAX_CUBES
+    emit(instrument, 'start', 'espresso')
+    dc = _dont_care_cover(dont_care, variables, deadline, max_cubes)
+    cover = espresso.minimize(node, variables, dc, deadline, max_cubes)
+    emit(instrument, 'end', 'espresso', cubes=len(cover))
+    if not cover or cover == [(0, (1 << len(variables)) - 1)]:
+        return bool(cover)
+    return cover
+
+
+def simplify_cover(node, variables, method='exact', dont_care=None, instrument=None, max_seconds=None,
+                   max_minterms=None, max_cubes=None):
+    deadline = None if max_seconds is None else time.monotonic() + max_seconds
+
+    if method not in ('exact', 'heuristic'):
+        raise ValueError('unknown method: %s' % method)
+    dont_care = _dont_care_min_terms(dont_care, variables)
+
+    try:
+        if method == 'exact':
+            try:
+                return _exact_cover(node, variables, dont_care, instrument, deadline, max_minterms)
+            except BudgetExceeded as e:
+                if e.stage != 'min_terms' or deadline is not None and time.monotonic() > deadline:
+                    raise
+                emit(instrument, 'degraded', e.stage, fallback='heuristic')
+        return _heuristic_cover(node, variables, dont_care, instrument, deadline, max_cubes)
+    except BudgetExceeded as e:
+        emit(instrument, 'degraded', e.stage, fallback='unsimplified')
+        return None
 
-    return ' | '.join(or_joined)
 
+def _exact_cover(node, variables, dont_care, instrument, deadline, max_minterms):
+    emit(instrument, 'start', 'min_terms')
+    sets = _exact_sets([node], variables, dont_care, max_minterms, deadline)[0]
+    check_deadline(deadline, 'min_terms')
+    if instrument is not None:
+        ones, dc = ((), ()) if isinstance(sets, bool) else sets
+        emit(instrument, 'end', 'min_terms', min_terms=len(ones), dont_cares=len(dc), constant=isinstance(sets, bool))
+
+    if isinstance(sets, bool):
+        return sets
+
+    ones, dc = sets
+    emit(instrument, 'start', 'merge')
+    rounds = None if instrument is None else []
+    primes = sorted(find_prime_implicants(create_cube_groups(sorted(ones + dc)), rounds, deadline))
+    emit(instrument, 'end', 'merge', rounds=rounds, primes=len(primes))
+
+    emit(instrument, 'start', 'cover')
+    chart = prime_implicant_chart(primes, ones)
+    stats = None if instrument is None else {}
+    remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+    selected = minimum_cover(chart, implicant_costs(primes, len(variables)), remaining, stats=stats)
+    if instrument is not None:
+        emit(instrument, 'end', 'cover', rows=len(chart), columns=len(primes), selected=len(selected), **stats)
+        if stats['timed_out']:
+            emit(instrument, 'degraded', 'cover', fallback='greedy')
+
+    return [primes[c] for c in selected]
+
+
+def simplify_multi_cover(nodes, variables, dont_care=None):
+    dont_care = _dont_care_min_terms(dont_care, variables)
+    sets = _exact_sets(list(nodes), variables, dont_care)
+    outputs = [k for k, s in enumerate(sets) if not isinstance(s, bool)]
+
+    tags = dict()
+    for k in outputs:
+        ones, dc = sets[k]
+        for m in ones + dc:
+            tags[m] = tags.get(m, 0) | 1 << k
+    primes = sorted(find_multi_output_primes(create_tagged_groups(tags)).items())
+
+    rows = {(k, m): 0 for k in outputs for m in sets[k][0]}
+    for column, (cube, tag) in enumerate(primes):
+        bit = 1 << column
+        for m in cube_min_terms(cube):
+            for k in outputs:
+                if tag >> k & 1 and (k, m) in rows:
+                    rows[k, m] |= bit
+    costs = implicant_costs([cube for cube, _ in primes], len(variables))
+    selected = sum(1 << c for c in minimum_cover(list(rows.values()), costs))
+
+    covers = list(sets)
+    for k in outputs:
+        output_rows = [rows[k, m] & selected for m in sets[k][0]]
+        covers[k] = [primes[c][0] for c in minimum_cover(output_rows, costs)]
+
+    return covers
+
+
+def _parse_dont_care(dont_care, variables):
+    if isinstance(dont_care, str):
+        dc_node, dc_variables = parse(dont_care)
+        if dc_node is None:
+            print('%s is not a valid logical expression' % dont_care)
+            return None, None
+        return dc_node, sorted(set(variables).union(dc_variables))
+    try:
+        return _dont_care_min_terms(dont_care, variables), variables
+    except ValueError as e:
+        print(e)
+        return None, None
+
+
+def simplify(expr, method='exact', dont_care=None, instrument=None, max_seconds=None, max_minterms=None,
+             output='sop', max_cubes=None):
+    if output not in ('sop', 'factored'):
+        raise ValueError('unknown output: %s' % output)
 
-def simplify(expr):
     if expr:
         if len(expr) < 1:
             return None
 
-        template, variables = validate(expr)
+        emit(instrument, 'start', 'validate')
+        node, variables = parse(expr)
+        emit(instrument, 'end', 'validate', valid=node is not None, variables=len(variables or ()))
 
-        if template is None or variables is None:
+        if node is None or variables is None:
             print('%s is not a valid logical expression' % expr)
             return None
 
-        min_terms, always_evaluates_to = get_min_terms(template, variables)
+        dont_care, variables = _parse_dont_care(dont_care, variables)
 
-        if always_evaluates_to is not None:
-            return always_evaluates_to
+        if variables is None:
+            return None
     else:
         return None
 
-    groups = create_groups(min_terms)
-    while True:
-        res = merge_groups(groups)
-        if res == collections.OrderedDict():
-            break
-        else:
-            groups = res
+    cover = simplify_cover(node, variables, method, dont_care, instrument, max_seconds, max_minterms, max_cubes)
 
-    prime_implicants = get_prime_implicants(groups, min_terms)
+    if isinstance(cover, bool):
+        return cover
+    elif cover is None:
+        return Unsimplified(to_string(node))
+
+    if output == 'factored':
+        emit(instrument, 'start', 'factor')
+        result, sop_literals, literals = make_factored(cover, variables)
+        emit(instrument, 'end', 'factor', sop_literals=sop_literals, literals=literals, length=len(result))
+        return result
+
+    emit(instrument, 'start', 'make_expr')
+    result = make_sop(cover, variables)
+    emit(instrument, 'end', 'make_expr', terms=len(cover), length=len(result))
+
+    return result
+
+
+def simplify_multi(exprs, dont_care=None):
+    nodes = []
+    variables = set()
+    for expr in exprs:
+        node, node_variables = parse(expr) if expr else (None, None)
+        if node is None:
+            print('%s is not a valid logical expression' % expr)
+            return None
+        nodes.append(node)
+        variables.update(node_variables)
+
+    dont_care, variables = _parse_dont_care(dont_care, sorted(variables))
+
+    if variables is None or not nodes:
+        return None
 
-    return make_expr(prime_implicants, variables)
+    return [cover if isinstance(cover, bool) else make_sop(cover, variables)
+            for cover in simplify_multi_cover(nodes, variables, dont_care)]
 
 
 def main():
@@ -4,8 +4,14 @@ A JSON-based image generator.
 """
 
 import argparse
+import ast
+import concurrent.futures
+import itertools
 import json
+import math
+import re
 import sys
+from array import array
 
 from PyQt5.QtCore import Qt, QPointF, QRectF
 from PyQt5.QtGui import QColor, QPen, QPainter, QPolygonF, QImage, QPixmap
@@ -16,33 +22,93 @@ __author__ = 'Jakub Starzyk'
 __email__ = 'jstarzyk98@gmail.com'
 
 
+def parse_color(value):
+    """
+    Parse a color value without evaluating code: strings holding Python literals, e.g. '(255, 0, 0)',
+    are converted with ast.literal_eval, other strings (names, '#rrggbb') are kept as they are.
+    :param value: color value from a specification
+    :return: tuple, number or string
+    """
+    if type(value) is str:
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            return value
+    elif type(value) is list:
+        return tuple(value)
+    return value
+
+
+def make_color(color):
+    """
+    Build a QColor object from a parsed color value.
+    :param color: tuple of components, number or string
+    :return: valid QColor object, or None
+    """
+    try:
+        qc = QColor(*color) if type(color) is tuple else QColor(color)
+    except TypeError:
+        return None
+    return qc if qc.isValid() else None
+
+
+class ColorCache:
+    """Resolve color values of one document to shared, pre-validated QColor objects."""
+
+    def __init__(self, palette):
+        """
+        Resolve all Palette entries once.
+        :param palette: Palette specification
+        """
+        self.palette = {}
+        if isinstance(palette, dict):
+            for name, value in palette.items():
+                self.palette[name] = make_color(tuple(value) if type(value) is list else value)
+        self.colors = {}
+
+    def resolve(self, value):
+        """
+        Get the QColor object of a color value.
+        :param value: color value from a specification
+        :return: valid QColor object, or None
+        """
+        key = tuple(value) if type(value) is list else value
+        try:
+            return self.colors[key]
+        except KeyError:
+            pass
+        except TypeError:
+            key = None
+
+        color = parse_color(value)
+        if type(color) is str and color in self.palette:
+            qc = self.palette[color]
+        else:
+            qc = make_color(color)
+
+        if key is not None:
+            self.colors[key] = qc
+        return qc
+
+
 def get_valid_color(screen, color_type, palette, default):
     """
     Get a valid QColor object.
     :param screen: Screen specification
     :param color_type: color key in the Screen specification
-    :param palette: Palette specification
+    :param palette: Palette specification, or a ColorCache object built from it
     :param default: default QColor object
     :return: valid QColor object
     """
     try:
-        color = eval(screen[color_type], None, None)
-    except (NameError, SyntaxError):
-        color = screen[color_type]
+        value = screen[color_type]
     except KeyError:
         return default
 
-    if type(color) is tuple:
-        qc = QColor(*color)
-    elif type(color) is str and palette and color in palette:
-        qc = QColor(palette[color])
-    else:
-        qc = QColor(color)
-
-    if not qc.isValid():
-        qc = default
+    colors = palette if isinstance(palette, ColorCache) else ColorCache(palette)
+    qc = colors.resolve(value)
 
-    return qc
+    return default if qc is None else qc
 
 
 class Media:
@@ -61,108 +127,401 @@ class Media:
             self.is_valid = False
 
 
+def number(value):
+    """
+    Check a coordinate.
+    :param value: value from a figure specification
+    :return: value as a float
+    """
+    if not isinstance(value, (int, float)):
+        raise TypeError('not a number: %r' % (value,))
+    try:
+        return float(value)
+    except OverflowError:
+        raise TypeError('number too large: %r' % (value,))
+
+
+def prepare_painter(painter, color, antialiased, outlined):
+    """
+    Set pen, brush and render hints for drawing figures.
+    :param painter: QPainter object
+    :param color: QColor object
+    :param antialiased: antialiasing render hint
+    :param outlined: draw with a pen of the color instead of no pen
+    """
+    painter.setPen(QPen(Qt.NoPen))
+    painter.setBrush(color)
+    painter.setRenderHint(QPainter.Antialiasing, antialiased)
+    if outlined:
+        painter.setPen(color)
+
+
 class Figure:
     """Parse and represent a figure specification."""
 
+    __slots__ = ('is_valid', 'color')
+    kind = None
+    antialiased = False
+    outlined = False
+
     def __init__(self, spec, palette, default):
         self.is_valid = True
         self.color = get_valid_color(spec, 'color', palette, default)
-        self.antialiased = False
+
+    @staticmethod
+    def parse(spec):
+        """
+        Get coordinates from a figure specification.
+        :param spec: figure specification
+        :return: tuple of floats
+        :raise KeyError, TypeError: invalid specification
+        """
+        raise NotImplementedError
+
+    def batch_key(self):
+        """Figures with equal keys can be drawn in one batch, with the same painter state."""
+        return self.kind, self.color.rgba(), self.antialiased
+
+    def setup_painter(self, painter):
+        """
+        Set pen, brush and render hints for drawing self.
+        :param painter: QPainter object
+        """
+        prepare_painter(painter, self.color, self.antialiased, self.outlined)
+
+    @staticmethod
+    def draw_batch(painter, figures):
+        """
+        Draw figures of one kind with the painter already set up.
+        :param painter: QPainter object
+        :param figures: list of figures
+        """
+        raise NotImplementedError
 
     def draw_with(self, painter):
         """
         Draw self using a QPainter object.
         :param painter: QPainter object
         """
-        painter.setPen(QPen(Qt.NoPen))
-        painter.setBrush(self.color)
-        painter.setRenderHint(QPainter.Antialiasing, self.antialiased)
+        self.setup_painter(painter)
+        self.draw_batch(painter, [self])
 
 
 class Point(Figure):
+    __slots__ = ('point',)
+    kind = 'point'
+    outlined = True
+
     def __init__(self, spec, palette, default):
         super().__init__(spec, palette, default)
         try:
-            self.point = QPointF(spec['x'], spec['y'])
+            self.point = QPointF(*self.parse(spec))
         except (KeyError, TypeError):
             self.is_valid = False
 
-    def draw_with(self, painter):
-        super().draw_with(painter)
-        painter.setPen(self.color)
-        painter.drawPoint(self.point)
+    @staticmethod
+    def parse(spec):
+        return number(spec['x']), number(spec['y'])
+
+    @staticmethod
+    def draw_batch(painter, figures):
+        painter.drawPoints(QPolygonF([f.point for f in figures]))
 
 
 class Polygon(Figure):
+    __slots__ = ('polygon',)
+    kind = 'polygon'
+    antialiased = True
+
     def __init__(self, spec, palette, default):
         super().__init__(spec, palette, default)
-        self.antialiased = True
         try:
-            points = []
-            for p in spec['points']:
-                try:
-                    points.append(QPointF(p[0], p[1]))
-                except (TypeError, IndexError):
-                    pass
-            self.polygon = QPolygonF(points)
+            coordinates = self.parse(spec)
+            self.polygon = QPolygonF([QPointF(coordinates[i], coordinates[i + 1])
+                                      for i in range(0, len(coordinates), 2)])
         except (KeyError, TypeError):
             self.is_valid = False
 
-    def draw_with(self, painter):
-        super().draw_with(painter)
-        painter.drawPolygon(self.polygon)
+    @staticmethod
+    def parse(spec):
+        coordinates = []
+        for p in spec['points']:
+            try:
+                coordinates.extend((number(p[0]), number(p[1])))
+            except (TypeError, IndexError):
+                pass
+        return tuple(coordinates)
+
+    @staticmethod
+    def draw_batch(painter, figures):
+        for f in figures:
+            painter.drawPolygon(f.polygon)
 
 
 class Rectangle(Figure):
+    __slots__ = ('rect',)
+    kind = 'rect'
+
     def __init__(self, spec, palette, default):
         super().__init__(spec, palette, default)
         try:
-            width = spec['width']
-            height = spec['height']
-            x = spec['x'] - width / 2
-            y = spec['y'] - height / 2
-            self.rect = QRectF(x, y, width, height)
+            self.rect = QRectF(*self.parse(spec))
         except (KeyError, TypeError):
             self.is_valid = False
 
-    def draw_with(self, painter):
-        super().draw_with(painter)
-        painter.drawRect(self.rect)
+    @staticmethod
+    def parse(spec):
+        width = number(spec['width'])
+        height = number(spec['height'])
+        x = number(spec['x']) - width / 2
+        y = number(spec['y']) - height / 2
+        return x, y, width, height
+
+    @staticmethod
+    def draw_batch(painter, figures):
+        painter.drawRects([f.rect for f in figures])
+
+
+class Square(Rectangle):
+    __slots__ = ()
 
+    @staticmethod
+    def parse(spec):
+        size = number(spec['size'])
+        x = number(spec['x']) - size / 2
+        y = number(spec['y']) - size / 2
+        return x, y, size, size
+
+
+class Circle(Figure):
+    __slots__ = ('point', 'radius')
+    kind = 'circle'
+    antialiased = True
 
-class Square(Figure):
     def __init__(self, spec, palette, default):
         super().__init__(spec, palette, default)
         try:
-            size = spec['size']
-            x = spec['x'] - size / 2
-            y = spec['y'] - size / 2
-            self.rect = QRectF(x, y, size, size)
+            x, y, self.radius = self.parse(spec)
+            self.point = QPointF(x, y)
         except (KeyError, TypeError):
             self.is_valid = False
 
-    def draw_with(self, painter):
-        super().draw_with(painter)
-        painter.drawRect(self.rect)
+    @staticmethod
+    def parse(spec):
+        radius = spec['radius']
+        x, y = number(spec['x']), number(spec['y'])
+        if type(radius) is int or type(radius) is float:
+            return x, y, number(radius)
+        raise TypeError
 
+    @staticmethod
+    def draw_batch(painter, figures):
+        for f in figures:
+            painter.drawEllipse(f.point, f.radius, f.radius)
 
-class Circle(Figure):
-    def __init__(self, spec, palette, default):
-        super().__init__(spec, palette, default)
-        self.antialiased = True
+
+figure_classes = {cls.__name__.lower(): cls for cls in (Point, Polygon, Rectangle, Square, Circle)}
+
+
+def make_figure(spec, palette, default):
+    """
+    Build a figure object from its specification.
+    :param spec: figure specification
+    :param palette: Palette specification, or a ColorCache object built from it
+    :param default: default QColor object
+    :return: valid figure object, or None
+    """
+    try:
+        figure = figure_classes[spec['type'].lower()](spec, palette, default)
+    except KeyError:
+        return None
+    return figure if figure.is_valid else None
+
+
+def draw_batch(painter, figures):
+    """
+    Draw a run of figures sharing the same batch key with a single painter setup.
+    :param painter: QPainter object
+    :param figures: list of figures
+    """
+    if figures:
+        figures[0].setup_painter(painter)
+        figures[0].draw_batch(painter, figures)
+
+
+class FigureView:
+    """Read-only figure object backed by a row of a FigureStore."""
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def kind(self):
+        return FigureStore.classes[self.store.kinds[self.index]].kind
+
+    @property
+    def antialiased(self):
+        return FigureStore.classes[self.store.kinds[self.index]].antialiased
+
+    @property
+    def color(self):
+        return QColor.fromRgba(self.store.colors[self.index])
+
+    @property
+    def coordinates(self):
+        return self.store.coordinates(self.index)
+
+    @property
+    def point(self):
+        return QPointF(*self.coordinates[:2])
+
+    @property
+    def radius(self):
+        return self.coordinates[2]
+
+    @property
+    def rect(self):
+        return QRectF(*self.coordinates)
+
+    @property
+    def polygon(self):
+        c = self.coordinates
+        return QPolygonF([QPointF(c[i], c[i + 1]) for i in range(0, len(c), 2)])
+
+
+class FigureStore:
+    """
+    Valid figures of a document in typed columns (array buffers), in drawing order:
+    kind code and RGBA color per figure, and the coordinates of all figures in one buffer
+    (x, y for points; x, y, width, height for rectangles and squares; x, y, radius for circles;
+    x and y of each vertex for polygons).
+    """
+
+    classes = (Point, Polygon, Rectangle, Circle)
+    codes = {cls.kind: code for code, cls in enumerate(classes)}
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.colors = array('I')
+        self.offsets = array('Q')
+        self.coords = array('d')
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError('figure index out of range')
+        return FigureView(self, index % len(self))
+
+    def add(self, spec, palette, default):
+        """
+        Parse and store a figure specification.
+        :param spec: figure specification
+        :param palette: Palette specification, or a ColorCache object built from it
+        :param default: default QColor object
+        :return: False if the specification is invalid
+        """
         try:
-            radius = spec['radius']
-            self.point = QPointF(spec['x'], spec['y'])
-            if type(radius) is int or type(radius) is float:
-                self.radius = radius
-            else:
-                raise TypeError
+            cls = figure_classes[spec['type'].lower()]
+            coordinates = cls.parse(spec)
         except (KeyError, TypeError):
-            self.is_valid = False
+            return False
+        self.kinds.append(self.codes[cls.kind])
+        self.colors.append(get_valid_color(spec, 'color', palette, default).rgba())
+        self.offsets.append(len(self.coords))
+        self.coords.extend(coordinates)
+        return True
+
+    def coordinates(self, index):
+        """
+        Get the coordinates of a figure.
+        :param index: figure index
+        :return: array of floats
+        """
+        end = self.offsets[index + 1] if index + 1 < len(self.offsets) else len(self.coords)
+        return self.coords[self.offsets[index]:end]
 
-    def draw_with(self, painter):
-        super().draw_with(painter)
-        painter.drawEllipse(self.point, self.radius, self.radius)
+    def subset(self, indices):
+        """
+        Copy some of the figures into a new store.
+        :param indices: figure indices, in drawing order
+        :return: FigureStore object
+        """
+        store = FigureStore()
+        for i in indices:
+            store.kinds.append(self.kinds[i])
+            store.colors.append(self.colors[i])
+            store.offsets.append(len(store.coords))
+            store.coords.extend(self.coordinates(i))
+        return store
+
+    def bounds(self, index):
+        """
+        Get the bounding box of a figure.
+        :param index: figure index
+        :return: left, top, right and bottom edges, or None for a polygon without vertices
+        """
+        kind = self.classes[self.kinds[index]].kind
+        c = self.coordinates(index)
+        if kind == 'point':
+            return c[0], c[1], c[0], c[1]
+        elif kind == 'rect':
+            return min(c[0], c[0] + c[2]), min(c[1], c[1] + c[3]), max(c[0], c[0] + c[2]), max(c[1], c[1] + c[3])
+        elif kind == 'circle':
+            r = abs(c[2])
+            return c[0] - r, c[1] - r, c[0] + r, c[1] + r
+        elif c:
+            return min(c[0::2]), min(c[1::2]), max(c[0::2]), max(c[1::2])
+        return None
+
+    def draw(self, painter, indices=None, batch_size=4096):
+        """
+        Draw stored figures in order, one batch per run of figures of the same kind and color.
+        :param painter: QPainter object
+        :param indices: figure indices in drawing order (all figures by default)
+        :param batch_size: maximum number of figures drawn in one batch
+        """
+        indices = range(len(self)) if indices is None else indices
+        batch = []
+        key = None
+        for i in indices:
+            figure_key = self.kinds[i], self.colors[i]
+            if figure_key != key or len(batch) >= batch_size:
+                self.draw_run(painter, key, batch)
+                batch = []
+                key = figure_key
+            batch.append(FigureView(self, i))
+        self.draw_run(painter, key, batch)
+
+    def draw_run(self, painter, key, figures):
+        """
+        Draw a run of figures sharing the same kind and color with a single painter setup.
+        :param painter: QPainter object
+        :param key: kind code and RGBA color of the figures
+        :param figures: list of FigureView objects
+        """
+        if figures:
+            cls = self.classes[key[0]]
+            prepare_painter(painter, QColor.fromRgba(key[1]), cls.antialiased, cls.outlined)
+            cls.draw_batch(painter, figures)
+
+
+def load_figures(figures, palette, default):
+    """
+    Parse figure specifications into a FigureStore.
+    :param figures: Figures specification
+    :param palette: Palette specification, or a ColorCache object built from it
+    :param default: default QColor object
+    :return: FigureStore object
+    """
+    store = FigureStore()
+    for f in figures:
+        store.add(f, palette, default)
+    return store
 
 
 class Drawing(QWidget):
@@ -185,6 +544,30 @@ class Drawing(QWidget):
         painter.drawPixmap(self.rect(), self.pixmap)
 
 
+def draw_figures(painter, figures, palette, default, batch_size=4096):
+    """
+    Draw figures in order, batching consecutive figures of the same kind, color and antialiasing.
+    :param painter: QPainter object
+    :param figures: Figures specification
+    :param palette: Palette specification, or a ColorCache object built from it
+    :param default: default QColor object
+    :param batch_size: maximum number of figures drawn in one batch
+    """
+    batch = []
+    key = None
+    for f in figures:
+        figure = make_figure(f, palette, default)
+        if figure is None:
+            continue
+        figure_key = figure.batch_key()
+        if figure_key != key or len(batch) >= batch_size:
+            draw_batch(painter, batch)
+            batch = []
+            key = figure_key
+        batch.append(figure)
+    draw_batch(painter, batch)
+
+
 def draw_image(figures, screen, palette):
     """
     Draw figures on an image.
@@ -193,25 +576,137 @@ def draw_image(figures, screen, palette):
     :param palette: Palette specification
     :return: parsed Media object, generated image
     """
-    media = Media(screen, palette)
+    colors = ColorCache(palette)
+    media = Media(screen, colors)
     if not media.is_valid:
         return None, None
     image = QImage(media.width, media.height, QImage.Format_RGB32)
     image.fill(media.bg_color)
     painter = QPainter(image)
+    draw_figures(painter, figures, colors, media.fg_color)
 
-    for f in figures:
-        try:
-            figure_class = globals()[f['type'].capitalize()]
-            figure = figure_class(f, palette, media.fg_color)
-            if figure.is_valid:
-                figure.draw_with(painter)
-        except KeyError:
-            pass
+    return media, image
+
+
+def bin_figures(store, width, height, tile_size, margin=2):
+    """
+    Assign figures to the square tiles of a canvas their bounding boxes (plus a margin) overlap.
+    :param store: FigureStore object
+    :param width: canvas width
+    :param height: canvas height
+    :param tile_size: tile width and height, in pixels
+    :param margin: pixels added around each bounding box, for antialiasing and pens
+    :return: dictionary of figure indices (in drawing order) by tile column and row
+    """
+    columns = (width + tile_size - 1) // tile_size
+    rows = (height + tile_size - 1) // tile_size
+    tiles = {}
+    for i in range(len(store)):
+        bounds = store.bounds(i)
+        if bounds is None:
+            continue
+        left, top, right, bottom = bounds
+        if not all(map(math.isfinite, bounds)):
+            left, top, right, bottom = 0, 0, width, height
+        first_column = max(int((left - margin) // tile_size), 0)
+        last_column = min(int((right + margin) // tile_size), columns - 1)
+        first_row = max(int((top - margin) // tile_size), 0)
+        last_row = min(int((bottom + margin) // tile_size), rows - 1)
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                tiles.setdefault((column, row), array('I')).append(i)
+    return tiles
+
+
+def render_tile(store, x, y, width, height, background):
+    """
+    Draw all figures of a store on one tile of the canvas.
+    :param store: FigureStore object with the figures overlapping the tile
+    :param x: left edge of the tile on the canvas
+    :param y: top edge of the tile on the canvas
+    :param width: tile width
+    :param height: tile height
+    :param background: RGBA background color
+    :return: tile pixels in QImage.Format_RGB32
+    """
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor.fromRgba(background))
+    painter = QPainter(image)
+    painter.translate(-x, -y)
+    store.draw(painter)
+    painter.end()
+    return image.constBits().asstring(image.byteCount())
+
+
+def draw_image_tiled(figures, screen, palette, tile_size=1024, workers=None):
+    """
+    Draw figures on an image tile by tile, in parallel worker processes.
+    Tiles are placed at integer offsets, so every pixel is rasterized as in draw_image.
+    :param figures: Figures specification
+    :param screen: Screen specification
+    :param palette: Palette specification
+    :param tile_size: tile width and height, in pixels
+    :param workers: number of worker processes (one per CPU by default, 1 to draw in this process)
+    :return: parsed Media object, generated image
+    """
+    colors = ColorCache(palette)
+    media = Media(screen, colors)
+    if not media.is_valid:
+        return None, None
+    store = load_figures(figures, colors, media.fg_color)
+    image = QImage(media.width, media.height, QImage.Format_RGB32)
+    image.fill(media.bg_color)
+    background = media.bg_color.rgba()
+
+    tiles = []
+    for (column, row), indices in sorted(bin_figures(store, media.width, media.height, tile_size).items()):
+        x, y = column * tile_size, row * tile_size
+        tiles.append((store.subset(indices), x, y, min(tile_size, media.width - x),
+                      min(tile_size, media.height - y), background))
+    del store
+
+    painter = QPainter(image)
+    painter.setCompositionMode(QPainter.CompositionMode_Source)
+    if workers == 1:
+        results = (render_tile(*tile) for tile in tiles)
+        stitch_tiles(painter, tiles, results)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            stitch_tiles(painter, tiles, executor.map(render_tile, *zip(*tiles)) if tiles else ())
+    painter.end()
 
     return media, image
 
 
+def stitch_tiles(painter, tiles, results):
+    """
+    Copy rendered tiles onto the canvas.
+    :param painter: QPainter object of the canvas, in source composition mode
+    :param tiles: render_tile arguments of each tile
+    :param results: tile pixels, in the order of tiles
+    """
+    for (_, x, y, width, height, _), pixels in zip(tiles, results):
+        painter.drawImage(x, y, QImage(pixels, width, height, QImage.Format_RGB32))
+
+
+def get_headers(content):
+    """
+    Get Screen and Palette specifications, or their defaults.
+    :param content: dictionary of top-level JSON values
+    :return: Screen and Palette specifications
+    """
+    try:
+        screen = content['Screen']
+    except KeyError:
+        screen = {'width': 800, 'height': 600, 'bg_color': 'black', 'fg_color': 'red'}
+    try:
+        palette = content['Palette']
+    except KeyError:
+        palette = None
+
+    return screen, palette
+
+
 def parse_json(input_file):
     """
     Parse JSON file into Figures, Screen, and Palette specifications (Python objects).
@@ -224,16 +719,167 @@ def parse_json(input_file):
             figures = content['Figures']
         except KeyError:
             figures = []
-        try:
-            screen = content['Screen']
-        except KeyError:
-            screen = {'width': 800, 'height': 600, 'bg_color': 'black', 'fg_color': 'red'}
-        try:
-            palette = content['Palette']
-        except KeyError:
-            palette = None
 
-    return figures, screen, palette
+    return (figures,) + get_headers(content)
+
+
+class JSONStream:
+    """Read a JSON document from a text file value by value, keeping only a small buffer in memory."""
+
+    whitespace = re.compile(r'[ \t\n\r]*')
+    delimiters = ' \t\n\r,:]}'
+
+    def __init__(self, file, chunk_size=1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        """
+        Read the next chunk of the file, dropping the consumed part of the buffer.
+        :return: False at the end of the file
+        """
+        chunk = '' if self.eof else self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Skip whitespace.
+        :return: next character, or an empty string at the end of the file
+        """
+        while True:
+            self.pos = self.whitespace.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, chars):
+        """
+        Consume one of the expected structural characters.
+        :param chars: expected characters
+        :return: consumed character
+        """
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError('expected one of %r, got %r' % (chars, c))
+        self.pos += 1
+        return c
+
+    def value(self):
+        """
+        Decode the next complete JSON value.
+        A value is complete once a delimiter follows it, so numbers split between chunks are not truncated.
+        :return: decoded Python object
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                if end < len(self.buffer) and self.buffer[end] in self.delimiters or self.eof:
+                    self.pos = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    def members(self):
+        """Yield the keys of an object; the value of each key has to be consumed before the next one."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+    def items(self):
+        """Yield the values of an array one at a time."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def read_json(input_file, headers, skip_figures=False):
+    """
+    Yield figure specifications from a JSON file, one at a time.
+    :param input_file: input JSON file
+    :param headers: dictionary filled with the other top-level values
+    :param skip_figures: only read the other top-level values
+    """
+    with open(input_file) as file:
+        stream = JSONStream(file)
+        for key in stream.members():
+            if key == 'Figures' and stream.peek() == '[':
+                for figure in stream.items():
+                    if not skip_figures:
+                        yield figure
+            else:
+                headers[key] = stream.value()
+
+
+def read_json_lines(input_file, headers, skip_figures=False):
+    """
+    Yield figure specifications from a JSON Lines file, one per line.
+    A line with a single Screen or Palette key sets that specification.
+    :param input_file: input JSON Lines file
+    :param headers: dictionary filled with Screen and Palette specifications
+    :param skip_figures: only read Screen and Palette specifications
+    """
+    with open(input_file) as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            spec = json.loads(line)
+            if type(spec) is dict and len(spec) == 1 and ('Screen' in spec or 'Palette' in spec):
+                headers.update(spec)
+            elif not skip_figures:
+                yield spec
+
+
+def parse_stream(input_file):
+    """
+    Parse Screen and Palette specifications, and open a stream of figure specifications.
+    Figures are read while drawing if Screen and Palette precede them in the file;
+    otherwise the file is scanned for Screen and Palette first.
+    :param input_file: input JSON or JSON Lines (.jsonl, .ndjson) file
+    :return: iterator of figure specifications, Screen and Palette specifications
+    """
+    read = read_json_lines if input_file.endswith(('.jsonl', '.ndjson')) else read_json
+    headers = {}
+    figures = read(input_file, headers)
+    end = object()
+    first = next(figures, end)
+
+    if first is end:
+        figures = iter(())
+    elif 'Screen' in headers and 'Palette' in headers:
+        figures = itertools.chain([first], figures)
+    else:
+        figures.close()
+        for _ in read(input_file, headers, skip_figures=True):
+            pass
+        figures = read(input_file, {})
+
+    return (figures,) + get_headers(headers)
 
 
 def setup_parser():
@@ -241,6 +887,8 @@ def setup_parser():
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument('input', help='JSON file containing image description')
     parser.add_argument('-o', '--output', help='generated image')
+    parser.add_argument('-t', '--tile-size', type=int, help='draw in tiles of this size, in parallel')
+    parser.add_argument('-w', '--workers', type=int, help='worker processes for tiled drawing (one per CPU by default)')
     return parser
 
 
@@ -248,7 +896,11 @@ def main():
     """Generate, show, and optionally save the image."""
     parser = setup_parser()
     args = parser.parse_args()
-    media, image = draw_image(*parse_json(args.input))
+    if args.tile_size or args.workers:
+        media, image = draw_image_tiled(*parse_stream(args.input), tile_size=args.tile_size or 1024,
+                                        workers=args.workers)
+    else:
+        media, image = draw_image(*parse_stream(args.input))
 
     if not media or not image:
         return
@@ -66,8 +66,9 @@ def gen_circles(figures, nx, width, height):
 
 
 def gen(width, height, bg_color, fg_color, type_, n):
-    """Generate file content: Screen and Figures specifications."""
-    result = {'Screen': {'width': width, 'height': height, 'bg_color': bg_color, 'fg_color': fg_color}}
+    """Generate file content: Screen, Palette and Figures specifications, in that order."""
+    result = {'Screen': {'width': width, 'height': height, 'bg_color': bg_color, 'fg_color': fg_color},
+              'Palette': None}
     figures = []
 
     if n < 1:
@@ -85,10 +86,18 @@ def gen(width, height, bg_color, fg_color, type_, n):
     return result
 
 
+def write_json_lines(file, result):
+    """Write file content as JSON Lines: Screen and Palette specifications first, then one figure per line."""
+    file.write(json.dumps({'Screen': result['Screen']}, separators=(',', ':')) + '\n')
+    file.write(json.dumps({'Palette': result.get('Palette')}, separators=(',', ':')) + '\n')
+    for figure in result['Figures']:
+        file.write(json.dumps(figure, separators=(',', ':')) + '\n')
+
+
 def setup_parser():
     """Setup argument parser."""
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument('output', help='generated image description')
+    parser.add_argument('output', help='generated image description (JSON Lines if it ends with .jsonl)')
     parser.add_argument('width', type=int, help='canvas width, in pixels')
     parser.add_argument('height', type=int, help='canvas height, in pixels')
     parser.add_argument('bg_color', help='background color')
@@ -105,7 +114,10 @@ def main():
     if args.output:
         with open(args.output, 'w+') as file:
             result = gen(args.width, args.height, args.bg_color, args.fg_color, args.type, args.n)
-            file.write(json.dumps(result, separators=(',', ':')))
+            if args.output.endswith('.jsonl'):
+                write_json_lines(file, result)
+            else:
+                file.write(json.dumps(result, separators=(',', ':')))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,125 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+try:
+    import PyQt5
+except ImportError:
+    PyQt5 = None
+else:
+    from img_generator.draw import *
+    from img_generator.gen import gen, write_json_lines
+
+
+def read_document(stream):
+    content = {}
+    for key in stream.members():
+        content[key] = list(stream.items()) if key == 'Figures' else stream.value()
+    return content
+
+
+@unittest.skipIf(PyQt5 is None, 'PyQt5 is not installed')
+class TestStream(unittest.TestCase):
+    document = {
+        'Version': 12.5,
+        'Screen': {'width': 20, 'height': 10, 'bg_color': 'black'},
+        'Figures': [1.25e3, 2, -0.5e-2, True, None, 'a, b', [], {}, {'type': 'point', 'x': -1E+2, 'y': 0}],
+        'Palette': {'red': [255, 0, 0]},
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as file:
+            file.write(text)
+        return path
+
+    def test_chunks(self):
+        for text in [json.dumps(self.document), json.dumps(self.document, indent=1, separators=(',', ' : ')),
+                     '{"Version": 12.5, "Figures": [1.25e3, 2]}']:
+            for chunk_size in range(1, 40):
+                self.assertEqual(read_document(JSONStream(io.StringIO(text), chunk_size)), json.loads(text),
+                                 (text, chunk_size))
+
+    def test_empty(self):
+        self.assertEqual(read_document(JSONStream(io.StringIO(' {} '), 1)), {})
+        self.assertEqual(read_document(JSONStream(io.StringIO('{"Figures": [ ]}'), 2)), {'Figures': []})
+
+    def test_invalid(self):
+        for text in ['{"a" 1}', '{"a": 1', '[1]', '{"Figures": [1 2]}', '{"a": 1.}']:
+            with self.assertRaises(ValueError):
+                read_document(JSONStream(io.StringIO(text), 3))
+
+    def test_read_json_lines(self):
+        path = self.write('scene.jsonl', '{"Screen": {"width": 5}}\n\n{"type": "point", "x": 1, "y": 2}\n'
+                                         '{"Palette": {"a": "red"}}\n{"Palette": 1, "type": "point"}\n')
+        headers = {}
+        self.assertEqual(list(read_json_lines(path, headers)),
+                         [{'type': 'point', 'x': 1, 'y': 2}, {'Palette': 1, 'type': 'point'}])
+        self.assertEqual(headers, {'Screen': {'width': 5}, 'Palette': {'a': 'red'}})
+        headers = {}
+        self.assertEqual(list(read_json_lines(path, headers, skip_figures=True)), [])
+        self.assertEqual(headers, {'Screen': {'width': 5}, 'Palette': {'a': 'red'}})
+
+    def test_parse_stream(self):
+        figures = self.document['Figures']
+        screen, palette = self.document['Screen'], self.document['Palette']
+        headers_first = {'Screen': screen, 'Palette': palette, 'Figures': figures}
+        figures_first = {'Figures': figures, 'Palette': palette, 'Screen': screen}
+        for name, content in [('first.json', headers_first), ('last.json', figures_first)]:
+            path = self.write(name, json.dumps(content))
+            parsed = parse_stream(path)
+            parsed = (list(parsed[0]),) + parsed[1:]
+            self.assertEqual(parsed, (figures, screen, palette), name)
+            self.assertEqual(parsed, parse_json(path), name)
+
+        specs = [f for f in figures if type(f) is dict]
+        lines = [json.dumps(f) for f in specs]
+        headers = [json.dumps({'Screen': screen}), json.dumps({'Palette': palette})]
+        for name, text in [('first.jsonl', headers + lines), ('last.jsonl', lines + headers[::-1])]:
+            parsed = parse_stream(self.write(name, '\n'.join(text)))
+            self.assertEqual((list(parsed[0]),) + parsed[1:], (specs, screen, palette), name)
+
+    def test_defaults(self):
+        figures, screen, palette = parse_stream(self.write('empty.json', '{"Figures": []}'))
+        self.assertEqual((list(figures), screen, palette), ([], get_headers({})[0], None))
+        figures, screen, palette = parse_stream(self.write('figures.jsonl', '{"type": "point", "x": 0, "y": 0}'))
+        self.assertEqual((list(figures), palette), ([{'type': 'point', 'x': 0, 'y': 0}], None))
+
+    def test_gen_single_pass(self):
+        result = gen(40, 30, 'black', 'red', 'circle', 3)
+        self.assertEqual(list(result), ['Screen', 'Palette', 'Figures'])
+        path = self.write('scene.json', json.dumps(result, separators=(',', ':')))
+        module = sys.modules[parse_stream.__module__]
+        passes = []
+
+        def counting_read_json(*args, **kwargs):
+            passes.append(args)
+            return read_json(*args, **kwargs)
+
+        module.read_json = counting_read_json
+        try:
+            figures, screen, palette = parse_stream(path)
+            self.assertEqual((list(figures), screen, palette), (result['Figures'], result['Screen'], None))
+        finally:
+            module.read_json = read_json
+        self.assertEqual(len(passes), 1)
+
+    def test_write_json_lines(self):
+        result = gen(40, 30, 'black', 'red', 'square', 2)
+        file = io.StringIO()
+        write_json_lines(file, result)
+        figures, screen, palette = parse_stream(self.write('scene.jsonl', file.getvalue()))
+        self.assertEqual((list(figures), screen, palette), (result['Figures'], result['Screen'], None))
+
+
+if __name__ == '__main__':
+    unittest.main()
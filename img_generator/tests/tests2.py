@@ -0,0 +1,194 @@
+import random
+import unittest
+
+try:
+    import PyQt5
+except ImportError:
+    PyQt5 = None
+else:
+    from img_generator.draw import *
+
+
+def scene(width, height, n, seed=0):
+    rng = random.Random(seed)
+    colors = ['red', 'blue', '(0, 255, 0)', '#123456', 'unknown', None]
+    figures = []
+    for _ in range(n):
+        kind = rng.choice(['point', 'point', 'rectangle', 'square', 'circle', 'polygon'])
+        spec = {'type': kind}
+        color = rng.choice(colors)
+        if color is not None:
+            spec['color'] = color
+        x, y = rng.uniform(-20, width + 20), rng.uniform(-20, height + 20)
+        if kind == 'point':
+            spec.update(x=rng.choice([x, round(x), 32, 64]), y=rng.choice([y, round(y), 32]))
+        elif kind == 'rectangle':
+            spec.update(x=x, y=y, width=rng.uniform(-40, 40), height=rng.uniform(-40, 40))
+        elif kind == 'square':
+            spec.update(x=x, y=y, size=rng.uniform(1, 40))
+        elif kind == 'circle':
+            spec.update(x=x, y=y, radius=rng.uniform(1, 40))
+        else:
+            spec['points'] = [[rng.uniform(-20, width + 20), rng.uniform(-20, height + 20)]
+                              for _ in range(rng.randint(3, 6))]
+        figures.append(spec)
+    return figures
+
+
+def pixels(image):
+    return image.constBits().asstring(image.byteCount())
+
+
+def render(draw, width, height):
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor('white'))
+    painter = QPainter(image)
+    draw(painter)
+    painter.end()
+    return pixels(image)
+
+
+@unittest.skipIf(PyQt5 is None, 'PyQt5 is not installed')
+class TestBatches(unittest.TestCase):
+    width, height = 160, 120
+
+    def test_make_figure(self):
+        default = QColor('red')
+        self.assertIsInstance(make_figure({'type': 'Square', 'x': 1, 'y': 2, 'size': 3}, None, default), Square)
+        self.assertIsNone(make_figure({'type': 'hexagon'}, None, default))
+        self.assertIsNone(make_figure({'type': 'circle', 'x': 1, 'y': 2}, None, default))
+        self.assertIsNone(make_figure({'type': 'point', 'x': 1, 'y': '2'}, None, default))
+        self.assertIsNone(make_figure({'type': 'circle', 'x': 1, 'y': 2, 'radius': 10 ** 400}, None, default))
+        self.assertIsNone(make_figure({'x': 1, 'y': 2}, None, default))
+
+    def test_batch_key(self):
+        default = QColor('red')
+        a = make_figure({'type': 'point', 'x': 1, 'y': 2}, None, default)
+        b = make_figure({'type': 'point', 'x': 3, 'y': 4, 'color': 'red'}, None, default)
+        c = make_figure({'type': 'point', 'x': 3, 'y': 4, 'color': 'blue'}, None, default)
+        d = make_figure({'type': 'circle', 'x': 1, 'y': 2, 'radius': 3}, None, default)
+        self.assertEqual(a.batch_key(), b.batch_key())
+        self.assertNotEqual(a.batch_key(), c.batch_key())
+        self.assertNotEqual(a.batch_key(), d.batch_key())
+
+    def test_draw_figures(self):
+        figures = scene(self.width, self.height, 300)
+        runs = sorted(figures, key=lambda f: (f['type'], str(f.get('color'))))
+        default = QColor('black')
+
+        def draw_one_by_one(painter, figures):
+            for spec in figures:
+                figure = make_figure(spec, None, default)
+                if figure is not None:
+                    figure.draw_with(painter)
+
+        for specs in [figures, runs]:
+            expected = render(lambda painter: draw_one_by_one(painter, specs), self.width, self.height)
+            for batch_size in [1, 3, 4096]:
+                self.assertEqual(render(lambda painter: draw_figures(painter, specs, None, default, batch_size),
+                                        self.width, self.height), expected, batch_size)
+
+
+@unittest.skipIf(PyQt5 is None, 'PyQt5 is not installed')
+class TestFigureStore(unittest.TestCase):
+    width, height = 160, 120
+
+    def test_add(self):
+        store = FigureStore()
+        default = QColor('red')
+        self.assertTrue(store.add({'type': 'point', 'x': 1, 'y': 2}, None, default))
+        self.assertTrue(store.add({'type': 'square', 'x': 1, 'y': 2, 'size': 3, 'color': 'blue'}, None, default))
+        self.assertTrue(store.add({'type': 'circle', 'x': 1, 'y': 2, 'radius': 3}, None, default))
+        self.assertTrue(store.add({'type': 'polygon', 'points': [[0, 0], [4, 0], [0, 3]]}, None, default))
+        self.assertFalse(store.add({'type': 'circle', 'x': 1, 'y': 2}, None, default))
+        self.assertFalse(store.add({'type': 'hexagon'}, None, default))
+        self.assertFalse(store.add({'type': 'circle', 'x': 1, 'y': 2, 'radius': 10 ** 400}, None, default))
+        self.assertFalse(store.add({'type': 'circle', 'x': 1, 'y': 2, 'radius': True}, None, default))
+        self.assertFalse(store.add({'type': 'square', 'x': 1, 'y': 2, 'size': 10 ** 400}, None, default))
+        self.assertFalse(store.add({'type': 'rectangle', 'x': 1, 'y': 2, 'width': 10 ** 400, 'height': 1},
+                                   None, default))
+        self.assertEqual(len(store), 4)
+        self.assertEqual([store[i].kind for i in range(4)], ['point', 'rect', 'circle', 'polygon'])
+        self.assertEqual(list(store.coordinates(1)), [-0.5, 0.5, 3, 3])
+        self.assertEqual(store[1].color.rgba(), QColor('blue').rgba())
+        self.assertEqual(store[0].point, QPointF(1, 2))
+        self.assertEqual(store[1].rect, QRectF(-0.5, 0.5, 3, 3))
+        self.assertEqual(store[2].radius, 3)
+        self.assertEqual(store[-1].polygon, QPolygonF([QPointF(0, 0), QPointF(4, 0), QPointF(0, 3)]))
+        self.assertTrue(store[3].antialiased)
+        with self.assertRaises(IndexError):
+            store[4]
+
+    def test_load_figures(self):
+        figures = scene(self.width, self.height, 300)
+        default = QColor('black')
+        store = load_figures(figures, ColorCache(None), default)
+        valid = [make_figure(f, None, default) for f in figures]
+        valid = [f for f in valid if f is not None]
+        self.assertEqual(len(store), len(valid))
+        self.assertEqual([store[i].color.rgba() for i in range(len(store))], [f.color.rgba() for f in valid])
+
+    def test_draw(self):
+        figures = scene(self.width, self.height, 300, seed=1)
+        default = QColor('black')
+        store = load_figures(figures, None, default)
+        expected = render(lambda painter: draw_figures(painter, figures, None, default), self.width, self.height)
+        for batch_size in [1, 5, 4096]:
+            self.assertEqual(render(lambda painter: store.draw(painter, batch_size=batch_size),
+                                    self.width, self.height), expected, batch_size)
+        valid = [f for f in figures if make_figure(f, None, default) is not None]
+        self.assertEqual(render(lambda painter: store.draw(painter, range(10, 20)), self.width, self.height),
+                         render(lambda painter: draw_figures(painter, valid[10:20], None, default),
+                                self.width, self.height))
+
+
+@unittest.skipIf(PyQt5 is None, 'PyQt5 is not installed')
+class TestTiles(unittest.TestCase):
+    width, height = 160, 120
+    screen = {'width': width, 'height': height, 'bg_color': '(20, 30, 40)', 'fg_color': 'yellow'}
+
+    def test_bounds(self):
+        store = load_figures([{'type': 'point', 'x': 1, 'y': 2},
+                              {'type': 'rectangle', 'x': 10, 'y': 20, 'width': -5, 'height': 5},
+                              {'type': 'circle', 'x': 10, 'y': 20, 'radius': -3},
+                              {'type': 'polygon', 'points': [[0, 5], [4, -1], [2, 3]]},
+                              {'type': 'polygon', 'points': []}], None, QColor('red'))
+        self.assertEqual([store.bounds(i) for i in range(len(store))],
+                         [(1, 2, 1, 2), (7.5, 17.5, 12.5, 22.5), (7, 17, 13, 23), (0, -1, 4, 5), None])
+
+    def test_subset(self):
+        store = load_figures(scene(self.width, self.height, 50), None, QColor('red'))
+        subset = store.subset([3, 7, 8])
+        self.assertEqual(len(subset), 3)
+        for i, j in enumerate([3, 7, 8]):
+            self.assertEqual((subset.kinds[i], subset.colors[i], subset.coordinates(i)),
+                             (store.kinds[j], store.colors[j], store.coordinates(j)))
+
+    def test_bin_figures(self):
+        store = load_figures([{'type': 'point', 'x': 31, 'y': 0},
+                              {'type': 'circle', 'x': 50, 'y': 50, 'radius': 5},
+                              {'type': 'point', 'x': -100, 'y': 10},
+                              {'type': 'rectangle', 'x': 0, 'y': 0, 'width': 1000, 'height': 1}], None, QColor('red'))
+        tiles = bin_figures(store, 100, 70, 32)
+        self.assertEqual({tile: list(indices) for tile, indices in tiles.items()},
+                         {(0, 0): [0, 3], (1, 0): [0, 3], (1, 1): [1], (2, 0): [3], (3, 0): [3]})
+        self.assertEqual({tile: list(indices) for tile, indices in bin_figures(store, 100, 70, 32, 0).items()},
+                         {(0, 0): [0, 3], (1, 0): [3], (1, 1): [1], (2, 0): [3], (3, 0): [3]})
+
+    def test_pixel_identical(self):
+        figures = scene(self.width, self.height, 400, seed=2)
+        media, image = draw_image(figures, self.screen, {'fg': 'blue'})
+        expected = pixels(image)
+        for tile_size, workers in [(32, 1), (50, 1), (7, 1), (1000, 1), (32, 2)]:
+            tiled_media, tiled = draw_image_tiled(figures, self.screen, {'fg': 'blue'}, tile_size, workers)
+            self.assertEqual((tiled.width(), tiled.height()), (self.width, self.height))
+            self.assertEqual(pixels(tiled), expected, (tile_size, workers))
+
+    def test_empty(self):
+        media, image = draw_image([], self.screen, None)
+        self.assertEqual(pixels(draw_image_tiled([], self.screen, None, 32, 1)[1]), pixels(image))
+        self.assertEqual(draw_image_tiled([], {'width': 0, 'height': 1}, None), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+try:
+    import PyQt5
+except ImportError:
+    PyQt5 = None
+else:
+    from img_generator.draw import *
+
+
+@unittest.skipIf(PyQt5 is None, 'PyQt5 is not installed')
+class TestColors(unittest.TestCase):
+    def test_parse_color(self):
+        self.assertEqual(parse_color('(255, 0, 0)'), (255, 0, 0))
+        self.assertEqual(parse_color([0, 0, 255, 128]), (0, 0, 255, 128))
+        self.assertEqual(parse_color('red'), 'red')
+        self.assertEqual(parse_color('#00ff00'), '#00ff00')
+        self.assertEqual(parse_color('0xff0000'), 0xff0000)
+        self.assertEqual(parse_color("__import__('os').getcwd()"), "__import__('os').getcwd()")
+        self.assertEqual(parse_color('(' * 1000), '(' * 1000)
+
+    def test_make_color(self):
+        self.assertEqual(make_color((255, 0, 0)).rgba(), QColor('red').rgba())
+        self.assertEqual(make_color('#0000ff').rgba(), QColor('blue').rgba())
+        self.assertIsNone(make_color('unknown'))
+        self.assertIsNone(make_color((1, 2)))
+        self.assertIsNone(make_color((1, 2, 'x')))
+        self.assertIsNone(make_color(None))
+
+    def test_color_cache(self):
+        colors = ColorCache({'sky': '#87ceeb', 'bad': 'unknown', 'rgb': [1, 2, 3]})
+        self.assertEqual(colors.resolve('sky').rgba(), QColor('#87ceeb').rgba())
+        self.assertIs(colors.resolve('sky'), colors.resolve('sky'))
+        self.assertIs(colors.resolve([1, 2, 3]), colors.resolve([1, 2, 3]))
+        self.assertEqual(colors.resolve([1, 2, 3]).rgba(), colors.resolve('(1, 2, 3)').rgba())
+        self.assertEqual(colors.resolve('rgb').rgba(), QColor(1, 2, 3).rgba())
+        self.assertIsNone(colors.resolve('bad'))
+        self.assertIsNone(colors.resolve({'r': 1}))
+        self.assertIsNone(ColorCache(None).resolve('sky'))
+
+    def test_get_valid_color(self):
+        default = QColor('black')
+        palette = {'fg': '#ffffff'}
+        colors = ColorCache(palette)
+        for spec, expected in [({'color': 'fg'}, 'white'), ({'color': '(0, 0, 255)'}, 'blue'),
+                               ({'color': 'unknown'}, 'black'), ({'color': [1, 2]}, 'black'), ({}, 'black')]:
+            self.assertEqual(get_valid_color(spec, 'color', colors, default).rgba(), QColor(expected).rgba(), spec)
+            self.assertEqual(get_valid_color(spec, 'color', palette, default).rgba(), QColor(expected).rgba(), spec)
+
+    def test_media(self):
+        media = Media({'width': 10, 'height': 5, 'bg_color': 'fg', 'fg_color': 'unknown'}, ColorCache({'fg': 'blue'}))
+        self.assertTrue(media.is_valid)
+        self.assertEqual((media.bg_color.rgba(), media.fg_color.rgba()), (QColor('blue').rgba(), QColor('red').rgba()))
+        self.assertFalse(Media({'width': 0, 'height': 5}, None).is_valid)
+        self.assertFalse(Media({'width': 10}, None).is_valid)
+
+
+if __name__ == '__main__':
+    unittest.main()